@@ -8,31 +8,65 @@ for Telegram delivery.
 Usage from OpenClaw:
     When a user requests a voice message, use this skill to generate audio
     and send it as a Telegram voice note.
+
+    For multi-message turns, use generate_voice_messages() or pipe JSONL
+    into ``rick_voice_skill.py --batch`` — messages are synthesized in
+    parallel so the whole turn takes about as long as the slowest message.
 """
 
+import json
 import os
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared, lazily created RickVoice — reused across calls so the provider
+# client (and its connection pool) stays warm.
+_rick = None
+_rick_lock = threading.Lock()
+
+
+def _get_rick():
+    global _rick
+    with _rick_lock:
+        if _rick is None:
+            from rick_voice import RickVoice
+
+            _rick = RickVoice()
+    return _rick
+
 
+def _write_unique(data: bytes, output_dir: str = None, suffix: str = ".ogg") -> str:
+    """Write data to a new, uniquely named file so invocations never collide."""
+    fd, path = tempfile.mkstemp(
+        prefix="rick_voice_msg_",
+        suffix=suffix,
+        dir=output_dir or tempfile.gettempdir(),
+    )
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
 
-def generate_voice_message(text: str, output_path: str = None) -> str:
+
+def generate_voice_message(
+    text: str, output_path: str = None, output_dir: str = None
+) -> str:
     """Generate a Rick Sanchez voice message from text.
 
     Args:
         text: The text to convert to speech.
-        output_path: Where to save the OGG file. If None, uses a temp file.
+        output_path: Where to save the OGG file. If None, a unique file is
+                     created once synthesis succeeds.
+        output_dir: Directory for that unique file (defaults to temp dir).
 
     Returns:
         Path to the generated OGG Opus audio file.
     """
-    from rick_voice import RickVoice
-
-    rick = RickVoice()
+    ogg_bytes = _get_rick().to_ogg(text)
 
     if output_path is None:
-        output_path = os.path.join(tempfile.gettempdir(), "rick_voice_msg.ogg")
-
-    ogg_bytes = rick.to_ogg(text)
+        return _write_unique(ogg_bytes, output_dir)
 
     with open(output_path, "wb") as f:
         f.write(ogg_bytes)
@@ -50,17 +84,146 @@ def generate_voice_bytes(text: str, format: str = "mp3") -> bytes:
     Returns:
         Audio bytes.
     """
-    from rick_voice import RickVoice
-
-    rick = RickVoice()
+    rick = _get_rick()
 
     if format == "ogg":
         return rick.to_ogg(text)
-    return rick.synthesize(text)
+    return rick.synthesize(text, output_format=format)
+
+
+def generate_voice_messages(
+    texts: list,
+    output_dir: str = None,
+    max_workers: int = 8,
+) -> list:
+    """Generate several Rick Sanchez voice messages in parallel.
+
+    All messages share one warm RickVoice instance. Each message gets its
+    own unique OGG file, so batches (and concurrent batches) never
+    overwrite each other.
+
+    Args:
+        texts: The texts to convert to speech.
+        output_dir: Directory for the OGG files. If None, uses the temp dir.
+        max_workers: Maximum number of messages synthesized at once.
+
+    Returns:
+        Paths to the generated OGG files, in the same order as ``texts``.
+
+    Raises:
+        Exception: The first failure, if any message fails. Files already
+                   written for the other messages are deleted first, so a
+                   failed batch leaves nothing behind.
+    """
+    if not texts:
+        return []
+
+    _get_rick().provider  # build the provider once, before fanning out
+
+    def _one(text):
+        return generate_voice_message(text, output_dir=output_dir)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as pool:
+        futures = [pool.submit(_one, text) for text in texts]
+
+    paths, error = [], None
+    for future in futures:
+        try:
+            paths.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        for path in paths:
+            os.unlink(path)
+        raise error
+    return paths
+
+
+def generate_voice_bytes_batch(
+    texts: list,
+    format: str = "mp3",
+    max_workers: int = 8,
+) -> list:
+    """Generate several Rick Sanchez audio clips as bytes, in parallel.
+
+    Args:
+        texts: The texts to convert to speech.
+        format: Audio format — "mp3", "wav", or "ogg".
+        max_workers: Maximum number of messages synthesized at once.
+
+    Returns:
+        Audio bytes per message, in the same order as ``texts``.
+    """
+    if not texts:
+        return []
+
+    _get_rick().provider
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as pool:
+        return list(pool.map(lambda t: generate_voice_bytes(t, format), texts))
+
+
+def _parse_batch_line(line: str) -> dict:
+    """Parse one JSONL batch line into a request dict or an error result."""
+    try:
+        item = json.loads(line)
+    except ValueError as e:
+        return {"text": None, "error": f"Invalid JSON: {e}"}
+
+    if isinstance(item, str):
+        item = {"text": item}
+    if not isinstance(item, dict) or not isinstance(item.get("text"), str):
+        return {
+            "text": None,
+            "error": f"Expected a string or an object with a 'text' string, got: {line}",
+        }
+
+    output_path = item.get("output_path")
+    if output_path is not None and not isinstance(output_path, str):
+        return {"text": item["text"], "error": "'output_path' must be a string"}
+    return item
+
+
+def _run_batch(stdin, stdout) -> None:
+    """Read JSONL requests from stdin, write JSONL results to stdout.
+
+    Each input line is either a JSON string or an object with a "text" key
+    and an optional "output_path". Each output line is
+    {"text": ..., "path": ...} or {"text": ..., "error": ...}, one per
+    non-blank input line and in the same order — a malformed line gets an
+    error result instead of aborting the batch.
+    """
+    requests = []
+    for line in stdin:
+        line = line.strip()
+        if line:
+            requests.append(_parse_batch_line(line))
+
+    if not requests:
+        return
+
+    _get_rick()
+
+    def _one(item):
+        if "error" in item:
+            return item
+        try:
+            path = generate_voice_message(item["text"], item.get("output_path"))
+            return {"text": item["text"], "path": path}
+        except Exception as e:
+            return {"text": item["text"], "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(requests))) as pool:
+        for result in pool.map(_one, requests):
+            stdout.write(json.dumps(result) + "\n")
+            stdout.flush()
 
 
 if __name__ == "__main__":
     # CLI usage for testing
-    text = " ".join(sys.argv[1:]) or "Wubba lubba dub dub, Morty!"
-    path = generate_voice_message(text)
-    print(f"Generated: {path}")
+    if sys.argv[1:] == ["--batch"]:
+        _run_batch(sys.stdin, sys.stdout)
+    else:
+        text = " ".join(sys.argv[1:]) or "Wubba lubba dub dub, Morty!"
+        path = generate_voice_message(text)
+        print(f"Generated: {path}")
@@ -4,6 +4,7 @@ rick-voice: Give any bot the voice of Rick Sanchez.
 
 from rick_voice.config import RickVoiceConfig
 from rick_voice.core import RickVoice
+from rick_voice.session import SpeechSession
 
 __version__ = "0.1.0"
-__all__ = ["RickVoice", "RickVoiceConfig"]
+__all__ = ["RickVoice", "RickVoiceConfig", "SpeechSession"]
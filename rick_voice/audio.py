@@ -0,0 +1,495 @@
+"""In-memory audio splicing at container level — no decoding, no ffmpeg.
+
+Joins and trims MP3 (at frame boundaries) and OGG Opus (at packet
+boundaries, repaginated with fresh granule positions, sequence numbers
+and CRCs). Everything happens on bytes in memory, so stitching a chunked
+synthesis or prepending an intro sting costs no process spawn.
+
+Usage:
+    from rick_voice import audio
+
+    joined = audio.concat(intro_mp3, line_mp3)       # format sniffed
+    first_second = audio.trim(joined, end_ms=1000)
+    audio.duration_ms(joined)
+
+Caveats: clips must share sample rate and channel layout (MP3) or channel
+count (Opus). MP3 frames can borrow bits from earlier frames, and Opus
+decoders need a few ms to settle, so the first ~20 ms after a cut point
+may sound slightly soft — inaudible in speech, but not sample-exact.
+
+Joined Opus clips are also a little longer than the sum of their parts:
+each join keeps the next clip's pre-skip (decoder warm-up, typically 312
+samples / 6.5 ms, decoded as a short burst of junk) and the previous
+clip's end padding (up to one packet of silence), since neither can be
+cut inside a packet without re-encoding.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+# ---------------------------------------------------------------------------
+# MP3
+# ---------------------------------------------------------------------------
+
+_MP3_BITRATES = {
+    # (mpeg1, layer): kbps by index
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG 1
+    2: (22050, 24000, 16000),  # MPEG 2
+    0: (11025, 12000, 8000),   # MPEG 2.5
+}
+
+
+@dataclass(frozen=True)
+class Mp3Frame:
+    """One MPEG audio frame located inside a byte buffer."""
+
+    offset: int
+    length: int
+    sample_rate: int
+    samples: int
+    channels: int
+    is_info: bool  # Xing/Info/VBRI header frame, carries no audio
+    bitrate: int   # kbps
+
+    @property
+    def duration_ms(self) -> float:
+        return self.samples * 1000.0 / self.sample_rate
+
+
+def _parse_mp3_header(data: bytes, pos: int) -> Optional[Mp3Frame]:
+    """Parse the frame header at pos, or return None if there isn't one."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None  # reserved values, or free-format (unsupported)
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+        samples = 384
+    elif layer == 2 or mpeg1:
+        length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+    else:
+        length = 72 * bitrate // sample_rate + padding
+        samples = 576
+
+    is_info = False
+    if layer == 3:
+        crc = 0 if b1 & 0x01 else 2
+        if mpeg1:
+            side_info = 17 if channels == 1 else 32
+        else:
+            side_info = 9 if channels == 1 else 17
+        tag_at = pos + 4 + crc + side_info
+        is_info = (
+            data[tag_at:tag_at + 4] in (b"Xing", b"Info")
+            or data[pos + 36:pos + 40] == b"VBRI"
+        )
+
+    return Mp3Frame(
+        pos, length, sample_rate, samples, channels, is_info, bitrate // 1000
+    )
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Return the offset just past a leading ID3v2 tag (0 if none)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def mp3_frames(data: bytes) -> List[Mp3Frame]:
+    """Locate every audio frame in an MP3 byte string.
+
+    ID3v2/ID3v1 tags and junk between frames are skipped.
+    """
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+
+    frames = []
+    pos = _skip_id3v2(data)
+    while pos + 4 <= end:
+        frame = _parse_mp3_header(data, pos)
+        if frame is None or pos + frame.length > end:
+            pos = data.find(b"\xff", pos + 1, end)
+            if pos < 0:
+                break
+            continue
+        frames.append(frame)
+        pos += frame.length
+    return frames
+
+
+def _mp3_audio_frames(data: bytes) -> List[Mp3Frame]:
+    return [f for f in mp3_frames(data) if not f.is_info]
+
+
+def concat_mp3(*clips: bytes) -> bytes:
+    """Join MP3 clips at frame boundaries.
+
+    Tags and Xing/Info headers are dropped (their duration fields would be
+    wrong for the joined stream).
+
+    Raises:
+        ValueError: If the clips' sample rates or channel counts differ.
+    """
+    parts = []
+    layout = None
+    for clip in clips:
+        frames = _mp3_audio_frames(clip)
+        if not frames:
+            continue
+        clip_layout = (frames[0].sample_rate, frames[0].channels)
+        if layout is None:
+            layout = clip_layout
+        elif clip_layout != layout:
+            raise ValueError(
+                f"Can't join MP3 clips with different formats: "
+                f"{layout} vs {clip_layout} (sample rate, channels)"
+            )
+        start, last = frames[0], frames[-1]
+        if all(
+            a.offset + a.length == b.offset for a, b in zip(frames, frames[1:])
+        ):
+            parts.append(clip[start.offset:last.offset + last.length])
+        else:
+            parts.extend(clip[f.offset:f.offset + f.length] for f in frames)
+    return b"".join(parts)
+
+
+def trim_mp3(data: bytes, start_ms: float = 0, end_ms: Optional[float] = None) -> bytes:
+    """Keep only the frames that overlap [start_ms, end_ms)."""
+    parts = []
+    t = 0.0
+    for frame in _mp3_audio_frames(data):
+        if t + frame.duration_ms > start_ms and (end_ms is None or t < end_ms):
+            parts.append(data[frame.offset:frame.offset + frame.length])
+        t += frame.duration_ms
+    return b"".join(parts)
+
+
+def mp3_duration_ms(data: bytes) -> float:
+    """Duration of an MP3 clip, summed over its frames."""
+    return sum(f.duration_ms for f in _mp3_audio_frames(data))
+
+
+# ---------------------------------------------------------------------------
+# OGG Opus
+# ---------------------------------------------------------------------------
+
+_OGG_HEADER = struct.Struct("<4sBBqIIIB")
+_OGG_CONTINUED, _OGG_BOS, _OGG_EOS = 0x01, 0x02, 0x04
+
+# Ogg's CRC-32 is the unreflected form of zlib's polynomial; computing it
+# through zlib on bit-reversed bytes keeps the inner loop in C.
+_BIT_REVERSE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def _ogg_crc(data: bytes) -> int:
+    crc = zlib.crc32(data.translate(_BIT_REVERSE), 0xFFFFFFFF) ^ 0xFFFFFFFF
+    return int(f"{crc:032b}"[::-1], 2)
+
+
+@dataclass
+class OpusStream:
+    """An OGG Opus stream split into its header and audio packets."""
+
+    head: bytes          # OpusHead packet
+    tags: bytes          # OpusTags packet
+    packets: List[bytes]
+    serial: int
+    final_granule: int   # granule of the last page (after end trimming)
+
+    @property
+    def channels(self) -> int:
+        return self.head[9]
+
+    @property
+    def pre_skip(self) -> int:
+        return struct.unpack_from("<H", self.head, 10)[0]
+
+
+def opus_packet_samples(packet: bytes) -> int:
+    """Number of 48 kHz samples in an Opus packet, from its TOC byte."""
+    if not packet:
+        return 0
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        frame = (480, 960, 1920, 2880)[config % 4]
+    elif config < 16:
+        frame = (480, 960)[config % 2]
+    else:
+        frame = (120, 240, 480, 960)[config % 4]
+
+    code = toc & 0x03
+    if code == 0:
+        count = 1
+    elif code in (1, 2):
+        count = 2
+    else:
+        count = packet[1] & 0x3F if len(packet) > 1 else 0
+    return frame * count
+
+
+def _ogg_packets(data: bytes):
+    """Yield (packet, serial, page_granule) for each packet in an OGG stream."""
+    pos = 0
+    pending = b""
+    while pos < len(data):
+        if data[pos:pos + 4] != b"OggS":
+            raise ValueError(f"Not an OGG page at offset {pos}")
+        _, _, _, granule, serial, _, _, n_segments = _OGG_HEADER.unpack_from(data, pos)
+        lacing = data[pos + 27:pos + 27 + n_segments]
+        body = pos + 27 + n_segments
+
+        start = body
+        size = 0
+        for lace in lacing:
+            size += lace
+            if lace < 255:
+                yield pending + data[start:start + size], serial, granule
+                pending = b""
+                start += size
+                size = 0
+        if size:
+            pending += data[start:start + size]
+        pos = body + sum(lacing)
+
+
+def parse_opus(data: bytes) -> OpusStream:
+    """Split an OGG Opus byte string into header and audio packets.
+
+    Raises:
+        ValueError: If the data isn't a single-stream OGG Opus file.
+    """
+    packets = []
+    serial = None
+    granule = 0
+    for packet, page_serial, page_granule in _ogg_packets(data):
+        if serial is None:
+            serial = page_serial
+        elif page_serial != serial:
+            raise ValueError("Multiplexed OGG streams are not supported")
+        packets.append(packet)
+        if page_granule >= 0:
+            granule = page_granule
+
+    if len(packets) < 2 or not packets[0].startswith(b"OpusHead"):
+        raise ValueError("Not an OGG Opus stream (missing OpusHead)")
+    if not packets[1].startswith(b"OpusTags"):
+        raise ValueError("Not an OGG Opus stream (missing OpusTags)")
+
+    return OpusStream(packets[0], packets[1], packets[2:], serial, granule)
+
+
+def _ogg_page(
+    flags: int, granule: int, serial: int, sequence: int, lacing: bytes, body: bytes
+) -> bytes:
+    header = _OGG_HEADER.pack(
+        b"OggS", 0, flags, granule, serial, sequence, 0, len(lacing)
+    )
+    page = header + lacing + body
+    crc = _ogg_crc(page)
+    return page[:22] + struct.pack("<I", crc) + page[26:]
+
+
+def _paginate(
+    packets: List[bytes],
+    granules: List[int],
+    serial: int,
+    sequence: int,
+    flags: int = 0,
+    last: bool = False,
+    max_body: int = 4096,
+):
+    """Pack packets into OGG pages. Returns (pages, next_sequence)."""
+    pages = []
+    lacing = bytearray()
+    body = bytearray()
+    granule = -1
+    continued = False
+
+    def flush(final: bool) -> None:
+        nonlocal lacing, body, granule, continued, sequence, flags
+        page_flags = flags | (_OGG_CONTINUED if continued else 0)
+        if final and last:
+            page_flags |= _OGG_EOS
+        pages.append(
+            _ogg_page(page_flags, granule, serial, sequence, bytes(lacing), bytes(body))
+        )
+        sequence += 1
+        flags = 0
+        continued = False
+        lacing, body, granule = bytearray(), bytearray(), -1
+
+    for i, (packet, packet_granule) in enumerate(zip(packets, granules)):
+        laces = [255] * (len(packet) // 255) + [len(packet) % 255]
+        offset = 0
+        for j, lace in enumerate(laces):
+            if len(lacing) == 255:
+                flush(False)
+                # The next page starts mid-packet unless we're at its start
+                continued = j > 0
+            lacing.append(lace)
+            body += packet[offset:offset + lace]
+            offset += lace
+        granule = packet_granule
+        is_last = i == len(packets) - 1
+        if is_last or len(body) >= max_body:
+            flush(is_last)
+    return pages, sequence
+
+
+def _write_opus(stream: OpusStream, packets: List[bytes], end_trim: int = 0) -> bytes:
+    """Serialize header + audio packets as a fresh OGG Opus stream."""
+    pages, sequence = _paginate([stream.head], [0], stream.serial, 0, flags=_OGG_BOS)
+    tag_pages, sequence = _paginate([stream.tags], [0], stream.serial, sequence)
+    pages += tag_pages
+
+    if packets:
+        granules = []
+        total = 0
+        for packet in packets:
+            total += opus_packet_samples(packet)
+            granules.append(total)
+        granules[-1] = max(0, total - end_trim)
+        audio_pages, _ = _paginate(packets, granules, stream.serial, sequence, last=True)
+        pages += audio_pages
+    return b"".join(pages)
+
+
+def _end_trim(stream: OpusStream) -> int:
+    total = sum(opus_packet_samples(p) for p in stream.packets)
+    return max(0, total - stream.final_granule)
+
+
+def concat_ogg(*clips: bytes) -> bytes:
+    """Join OGG Opus clips into one stream at packet boundaries.
+
+    The first clip's headers are kept; packets from every clip are
+    repaginated with continuous granule positions and sequence numbers.
+    Only the first clip's pre-skip and the last clip's end padding are
+    trimmed on playback — each join adds the next clip's pre-skip and the
+    previous clip's end padding (see the module caveats).
+
+    Raises:
+        ValueError: If the clips aren't Opus or their channel counts differ.
+    """
+    streams = [parse_opus(c) for c in clips if c]
+    if not streams:
+        return b""
+    first = streams[0]
+    for other in streams[1:]:
+        if other.channels != first.channels:
+            raise ValueError(
+                f"Can't join Opus clips with different channel counts: "
+                f"{first.channels} vs {other.channels}"
+            )
+
+    packets = [p for s in streams for p in s.packets]
+    return _write_opus(first, packets, end_trim=_end_trim(streams[-1]))
+
+
+def trim_ogg(data: bytes, start_ms: float = 0, end_ms: Optional[float] = None) -> bytes:
+    """Keep only the Opus packets that overlap [start_ms, end_ms).
+
+    Times are playable time, i.e. after the pre-skip. The original
+    pre-skip is kept, so the decoder still discards its warm-up samples
+    at the new start. Returns b"" if no packet overlaps the range (as
+    trim_mp3 does), rather than a header-only stream.
+    """
+    stream = parse_opus(data)
+    start = stream.pre_skip + start_ms * 48
+    end = None if end_ms is None else stream.pre_skip + end_ms * 48
+
+    kept = []
+    t = 0
+    for packet in stream.packets:
+        samples = opus_packet_samples(packet)
+        if t + samples > start and (end is None or t < end):
+            kept.append(packet)
+        t += samples
+    if not kept:
+        return b""
+
+    end_trim = _end_trim(stream) if end is None else 0
+    return _write_opus(stream, kept, end_trim)
+
+
+def ogg_duration_ms(data: bytes) -> float:
+    """Playable duration of an OGG Opus clip (excluding pre-skip)."""
+    stream = parse_opus(data)
+    return max(0, stream.final_granule - stream.pre_skip) / 48.0
+
+
+# ---------------------------------------------------------------------------
+# Format-sniffing helpers
+# ---------------------------------------------------------------------------
+
+
+def detect_format(data: bytes) -> str:
+    """Return "ogg" or "mp3" for a clip.
+
+    Raises:
+        ValueError: If the clip is neither.
+    """
+    if data[:4] == b"OggS":
+        return "ogg"
+    if data[:3] == b"ID3" or _parse_mp3_header(data, 0) is not None or mp3_frames(data[:8192]):
+        return "mp3"
+    raise ValueError("Unsupported audio format — expected MP3 or OGG Opus")
+
+
+def concat(*clips: bytes) -> bytes:
+    """Join MP3 or OGG Opus clips without re-encoding (format sniffed)."""
+    clips = tuple(c for c in clips if c)
+    if not clips:
+        return b""
+    fmt = detect_format(clips[0])
+    return concat_ogg(*clips) if fmt == "ogg" else concat_mp3(*clips)
+
+
+def trim(data: bytes, start_ms: float = 0, end_ms: Optional[float] = None) -> bytes:
+    """Trim an MP3 or OGG Opus clip at frame/packet boundaries."""
+    if detect_format(data) == "ogg":
+        return trim_ogg(data, start_ms, end_ms)
+    return trim_mp3(data, start_ms, end_ms)
+
+
+def duration_ms(data: bytes) -> float:
+    """Duration of an MP3 or OGG Opus clip in milliseconds."""
+    if detect_format(data) == "ogg":
+        return ogg_duration_ms(data)
+    return mp3_duration_ms(data)
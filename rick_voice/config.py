@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields, replace
 from typing import Optional
 
 
@@ -25,6 +25,7 @@ class RickVoiceConfig:
     # Fish Audio settings
     fish_api_key: Optional[str] = None
     fish_voice_id: str = "d2e75a3e3fd6419893057c02a375a113"  # Rick Sanchez model
+    fish_latency: str = "balanced"  # "normal" (best quality) or "balanced"
 
     # ElevenLabs settings
     elevenlabs_api_key: Optional[str] = None
@@ -36,6 +37,13 @@ class RickVoiceConfig:
 
     # Audio output settings
     output_format: str = "mp3"  # "mp3", "wav", "pcm", "ogg"
+    mp3_bitrate: Optional[int] = None  # kbps, e.g. 64/128/192 (provider default if None)
+    sample_rate: Optional[int] = None  # Hz (provider default if None)
+
+    # Post-processing (requires numpy + ffmpeg): trim silence, normalize loudness
+    postprocess_enabled: bool = False
+    silence_threshold_db: Optional[float] = -45.0  # None disables trimming
+    target_lufs: Optional[float] = -16.0  # None disables normalization
 
     # Rickifier settings
     rickify_enabled: bool = False  # Off by default — voice model handles it
@@ -50,6 +58,33 @@ class RickVoiceConfig:
         if self.elevenlabs_voice_id is None:
             self.elevenlabs_voice_id = os.environ.get("RICK_VOICE_ID", "")
 
+    # Settings that are baked into the provider's client and so can't be
+    # changed per call without rebuilding it.
+    CLIENT_FIELDS = ("provider", "fish_api_key", "elevenlabs_api_key")
+
+    def with_overrides(self, **overrides) -> "RickVoiceConfig":
+        """Return a copy of this config with per-call overrides applied.
+
+        The original config is never modified, so the copy can be used
+        for a single request while other threads keep using the base.
+
+        Raises:
+            ValueError: If an override is not a config field, or is one of
+                CLIENT_FIELDS (those need a new RickVoice instance).
+        """
+        if not overrides:
+            return self
+        known = {f.name for f in fields(self)}
+        for key in overrides:
+            if key not in known:
+                raise ValueError(f"Unknown config override: {key!r}")
+            if key in self.CLIENT_FIELDS:
+                raise ValueError(
+                    f"{key!r} can't be overridden per call. "
+                    f"Create a separate RickVoice for a different provider or key."
+                )
+        return replace(self, **overrides)
+
     @classmethod
     def from_env(cls, provider: Optional[str] = None) -> "RickVoiceConfig":
         """Create config from environment variables.
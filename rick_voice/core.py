@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Optional
 
 from rick_voice.config import RickVoiceConfig
-from rick_voice.providers import TTSProvider
+from rick_voice.providers import TTSProvider, config_args
 from rick_voice.rickifier import rickify
 
+if TYPE_CHECKING:
+    from rick_voice.tuning import AutoTuner
+
 
 class RickVoice:
     """Rick Sanchez text-to-speech.
@@ -24,6 +30,9 @@ class RickVoice:
         # With ElevenLabs
         rick = RickVoice(provider="elevenlabs")
 
+        # Per-call overrides reuse the same provider client
+        wav = rick.synthesize("Science!", output_format="wav")
+
     Environment variables:
         RICK_VOICE_PROVIDER  - "fish" or "elevenlabs" (default: "fish")
         FISH_API_KEY         - Fish Audio API key
@@ -35,6 +44,8 @@ class RickVoice:
         self,
         provider: Optional[str] = None,
         config: Optional[RickVoiceConfig] = None,
+        tts_provider: Optional[TTSProvider] = None,
+        tuner: Optional[AutoTuner] = None,
         **kwargs,
     ):
         """Initialize RickVoice.
@@ -43,6 +54,11 @@ class RickVoice:
             provider: TTS provider ("fish", "elevenlabs", or "local").
                       Overrides config.provider if set.
             config: Full config object. If None, creates from env vars.
+            tts_provider: Ready-made provider instance to use instead of
+                          building one from config (e.g. a
+                          RecordingProvider or ReplayProvider).
+            tuner: AutoTuner that picks latency/bitrate/sample rate per
+                   request for synthesize() and stream().
             **kwargs: Passed to RickVoiceConfig if config is None.
         """
         if config is None:
@@ -54,13 +70,23 @@ class RickVoice:
             config.provider = provider
 
         self.config = config
-        self._provider: Optional[TTSProvider] = None
+        self._provider: Optional[TTSProvider] = tts_provider
+        self._provider_lock = threading.Lock()
+        self.tuner = tuner
+        # Recent PostProcessResult reports (when postprocess_enabled)
+        self.postprocess_reports: deque = deque(maxlen=100)
 
     @property
     def provider(self) -> TTSProvider:
-        """Lazy-load the TTS provider."""
+        """Lazy-load the TTS provider.
+
+        Safe to call from several threads — only one provider (and one
+        underlying API client) is ever built per instance.
+        """
         if self._provider is None:
-            self._provider = self._create_provider()
+            with self._provider_lock:
+                if self._provider is None:
+                    self._provider = self._create_provider()
         return self._provider
 
     def _create_provider(self) -> TTSProvider:
@@ -87,80 +113,176 @@ class RickVoice:
                 f"Choose from: 'fish', 'elevenlabs'"
             )
 
-    def _prepare_text(self, text: str) -> str:
+    def _prepare_text(
+        self, text: str, config: Optional[RickVoiceConfig] = None
+    ) -> str:
         """Apply rickifier if enabled."""
-        if self.config.rickify_enabled:
-            return rickify(text, self.config.rickify_intensity)
+        config = config or self.config
+        if config.rickify_enabled:
+            return rickify(text, config.rickify_intensity)
         return text
 
-    def synthesize(self, text: str) -> bytes:
+    def _config_args(self, config: RickVoiceConfig) -> tuple:
+        """Only pass a per-call config to the provider when it has overrides."""
+        return config_args(None if config is self.config else config)
+
+    def _tune(self, method: str, text: str, overrides: dict):
+        """Merge the tuner's choice under the caller's overrides.
+
+        Returns (candidate index, overrides). The index is -1 when there's
+        no tuner, or when the caller pinned a setting the tuner would set
+        (the measurement wouldn't belong to the candidate).
+        """
+        if self.tuner is None:
+            return -1, overrides
+        provider = self.config.provider.lower()
+        output_format = overrides.get("output_format", self.config.output_format)
+        if self.tuner.tuned_keys(provider, output_format) & set(overrides):
+            return -1, overrides
+        candidate, tuned = self.tuner.choose(provider, method, text, output_format)
+        return candidate, {**tuned, **overrides}
+
+    def _synthesize_raw(self, text: str, overrides: dict):
+        """Synthesize without post-processing. Returns (audio, config)."""
+        candidate, overrides = self._tune("synthesize", text, overrides)
+        config = self.config.with_overrides(**overrides)
+        prepared = self._prepare_text(text, config)
+        if candidate < 0:
+            return self.provider.synthesize(prepared, *self._config_args(config)), config
+
+        # Without streaming, the whole response is the "first byte"
+        start = time.perf_counter()
+        try:
+            audio = self.provider.synthesize(
+                prepared, *self._config_args(config)
+            )
+        except Exception:
+            self.tuner.record_failure(
+                self.config.provider.lower(), "synthesize", text, candidate
+            )
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.tuner.record(
+            self.config.provider.lower(), "synthesize", text, candidate,
+            elapsed_ms, len(audio), elapsed_ms,
+        )
+        return audio, config
+
+    def _postprocess(self, audio: bytes, config: RickVoiceConfig, output_format=None):
+        """Run the post-processing stage and keep its report."""
+        from rick_voice.postprocess import postprocess_with_config
+
+        report = postprocess_with_config(
+            audio,
+            config,
+            encoding=self.provider.output_encoding(*self._config_args(config)),
+            output_format=output_format,
+        )
+        self.postprocess_reports.append(report)
+        return report.audio
+
+    def synthesize(self, text: str, **overrides) -> bytes:
         """Convert text to audio bytes in Rick's voice.
 
         Args:
             text: Text to speak.
+            **overrides: Per-call config overrides, e.g. output_format="wav"
+                         or fish_voice_id="...". Applied to a copy of the
+                         config; the shared provider client is reused.
 
         Returns:
             Audio bytes (MP3 by default).
         """
-        prepared = self._prepare_text(text)
-        return self.provider.synthesize(prepared)
+        audio, config = self._synthesize_raw(text, overrides)
+        if config.postprocess_enabled:
+            audio = self._postprocess(audio, config)
+        return audio
 
-    def play(self, text: str) -> None:
+    def play(self, text: str, **overrides) -> None:
         """Speak text through speakers in Rick's voice.
 
         Args:
             text: Text to speak.
+            **overrides: Per-call config overrides (see synthesize()).
         """
-        prepared = self._prepare_text(text)
-        self.provider.play(prepared)
+        config = self.config.with_overrides(**overrides)
+        prepared = self._prepare_text(text, config)
+        self.provider.play(prepared, *self._config_args(config))
 
-    def stream(self, text: str):
+    def stream(self, text: str, **overrides):
         """Stream audio chunks in Rick's voice.
 
         Args:
             text: Text to speak.
+            **overrides: Per-call config overrides (see synthesize()).
 
         Returns:
             Iterator of audio chunks.
         """
-        prepared = self._prepare_text(text)
-        return self.provider.stream(prepared)
+        candidate, overrides = self._tune("stream", text, overrides)
+        config = self.config.with_overrides(**overrides)
+        prepared = self._prepare_text(text, config)
+        if candidate < 0:
+            return self.provider.stream(prepared, *self._config_args(config))
+        try:
+            chunks = self.provider.stream(prepared, *self._config_args(config))
+        except Exception:
+            self.tuner.record_failure(
+                self.config.provider.lower(), "stream", text, candidate
+            )
+            raise
+        return self.tuner.measure_stream(
+            chunks, self.config.provider.lower(), text, candidate
+        )
+
+    def session(self, **kwargs):
+        """Start an incremental session that speaks text as it is fed in.
+
+        Args:
+            **kwargs: Passed to SpeechSession (min_chars, max_ahead, and
+                      per-call config overrides).
+
+        Returns:
+            A SpeechSession — call feed()/close() and iterate it for audio,
+            or cancel() it to stop early.
+        """
+        from rick_voice.session import SpeechSession
 
-    def to_ogg(self, text: str) -> bytes:
+        return SpeechSession(self, **kwargs)
+
+    def to_ogg(self, text: str, **overrides) -> bytes:
         """Generate OGG Opus audio — ideal for Telegram voice messages.
 
         Args:
             text: Text to speak.
+            **overrides: Per-call config overrides (see synthesize()).
 
         Returns:
             OGG Opus audio bytes.
         """
-        import subprocess
-        import tempfile
-        import os
-
-        mp3_bytes = self.synthesize(text)
-
-        tmp_in = os.path.join(tempfile.gettempdir(), "rick_voice_in.mp3")
-        tmp_out = os.path.join(tempfile.gettempdir(), "rick_voice_out.ogg")
-
-        with open(tmp_in, "wb") as f:
-            f.write(mp3_bytes)
-
-        subprocess.run(
-            [
-                "ffmpeg", "-y", "-i", tmp_in,
-                "-c:a", "libopus", "-b:a", "64k",
-                tmp_out,
-            ],
-            capture_output=True,
-            check=True,
-        )
+        audio, config = self._synthesize_raw(text, overrides)
+        if config.postprocess_enabled:
+            # Trim and gain are applied inside the single Opus encode
+            return self._postprocess(audio, config, output_format="ogg")
+        return _transcode_to_ogg(audio)
 
-        with open(tmp_out, "rb") as f:
-            ogg_bytes = f.read()
 
-        os.unlink(tmp_in)
-        os.unlink(tmp_out)
+def _transcode_to_ogg(audio: bytes) -> bytes:
+    """Transcode audio bytes to OGG Opus with ffmpeg.
 
-        return ogg_bytes
+    Audio is piped through ffmpeg's stdin/stdout rather than fixed temp
+    files, so concurrent calls can't clobber each other's output.
+    """
+    import subprocess
+
+    result = subprocess.run(
+        [
+            "ffmpeg", "-y", "-i", "pipe:0",
+            "-c:a", "libopus", "-b:a", "64k",
+            "-f", "ogg", "pipe:1",
+        ],
+        input=audio,
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout
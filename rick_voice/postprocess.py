@@ -0,0 +1,540 @@
+"""Silence trimming and loudness normalization for synthesized clips.
+
+Clips are decoded to PCM once (48 kHz mono float) and analysed with NumPy
+block operations:
+
+  - a vectorized energy detector finds leading/trailing silence
+  - an ITU-R BS.1770 style gated loudness measurement (the signal is
+    K-weighted once by FFT overlap-add, then 400 ms block powers come from
+    a cumulative sum) gives the gain needed to hit a target LUFS
+
+If only silence changed, MP3 and OGG Opus clips are cut at frame/packet
+boundaries with rick_voice.audio — no re-encode. Audio is only re-encoded
+when the gain changes, and returned untouched when nothing changed.
+
+For streams of PCM blocks, StreamProcessor applies the same detector
+block by block, holding back trailing silence until speech resumes.
+
+Requires: pip install numpy (and ffmpeg for decoding/encoding clips)
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from rick_voice.config import RickVoiceConfig
+
+
+SAMPLE_RATE = 48000
+OPUS_BITRATE = 64      # kbps, as in RickVoice.to_ogg()'s plain transcode
+FRAME_MS = 10          # energy detector resolution
+PAD_MS = 60            # silence kept around speech so onsets aren't clipped
+GAIN_TOLERANCE_DB = 0.5
+PEAK_CEILING_DB = -1.0
+
+# BS.1770 K-weighting stages as analog prototypes (f0, Q); the biquads are
+# derived per sample rate and reproduce the spec's 48 kHz coefficients.
+_SHELF_F0, _SHELF_Q, _SHELF_GAIN_DB = 1681.974450955533, 0.7071752369554196, 3.999843853973347
+_HIGHPASS_F0, _HIGHPASS_Q = 38.13547087602444, 0.5003270373238773
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "NumPy not installed. Run: pip install rick-voice[postprocess]"
+        )
+    return numpy
+
+
+@dataclass
+class PostProcessResult:
+    """Outcome of post-processing one clip."""
+
+    audio: bytes
+    bytes_before: int
+    bytes_after: int               # may be another format (see output_format)
+    bytes_trimmed: int             # silence removed, in the source container
+    leading_ms_trimmed: float
+    trailing_ms_trimmed: float
+    loudness_lufs: Optional[float]  # measured before processing
+    gain_db: float
+    reencoded: bool
+    elapsed_ms: float
+
+    @property
+    def ms_trimmed(self) -> float:
+        return self.leading_ms_trimmed + self.trailing_ms_trimmed
+
+
+# ---------------------------------------------------------------------------
+# Analysis (NumPy, vectorized)
+# ---------------------------------------------------------------------------
+
+
+def frame_levels_db(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """RMS level in dBFS of each FRAME_MS frame of a mono float signal."""
+    np = _numpy()
+    frame = sample_rate * FRAME_MS // 1000
+    n = -(-len(pcm) // frame)
+    padded = np.zeros(n * frame, dtype=np.float32)
+    padded[:len(pcm)] = pcm
+    frames = padded.reshape(n, frame)
+    return 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+
+
+def speech_bounds(
+    pcm: np.ndarray,
+    threshold_db: float = -45.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> tuple:
+    """Sample range (start, end) of the non-silent part of a signal.
+
+    Returns (0, 0) for an all-silent signal.
+    """
+    np = _numpy()
+    loud = np.flatnonzero(frame_levels_db(pcm, sample_rate) > threshold_db)
+    if not len(loud):
+        return 0, 0
+    frame = sample_rate * FRAME_MS // 1000
+    pad = sample_rate * PAD_MS // 1000
+    start = max(0, loud[0] * frame - pad)
+    end = min(len(pcm), (loud[-1] + 1) * frame + pad)
+    return int(start), int(end)
+
+
+def k_weighting(sample_rate: int = SAMPLE_RATE) -> tuple:
+    """BS.1770 K-weighting biquads ((b, a) for shelf and high-pass) at a rate."""
+    import math
+
+    k = math.tan(math.pi * _SHELF_F0 / sample_rate)
+    vh = 10 ** (_SHELF_GAIN_DB / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / _SHELF_Q + k * k
+    shelf = (
+        ((vh + vb * k / _SHELF_Q + k * k) / a0,
+         2 * (k * k - vh) / a0,
+         (vh - vb * k / _SHELF_Q + k * k) / a0),
+        (1.0, 2 * (k * k - 1) / a0, (1 - k / _SHELF_Q + k * k) / a0),
+    )
+
+    k = math.tan(math.pi * _HIGHPASS_F0 / sample_rate)
+    a0 = 1 + k / _HIGHPASS_Q + k * k
+    highpass = (
+        (1.0, -2.0, 1.0),
+        (1.0, 2 * (k * k - 1) / a0, (1 - k / _HIGHPASS_Q + k * k) / a0),
+    )
+    return shelf, highpass
+
+
+def _k_weighting_response(n_fft: int, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """H(f) of the K-weighting filter at rfft bin frequencies."""
+    np = _numpy()
+    z = np.exp(-2j * np.pi * np.arange(n_fft // 2 + 1) / n_fft)
+    response = np.ones_like(z)
+    for b, a in k_weighting(sample_rate):
+        response *= (b[0] + b[1] * z + b[2] * z ** 2) / (a[0] + a[1] * z + a[2] * z ** 2)
+    return response
+
+
+def _k_weighted(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """K-weight a whole signal by FFT overlap-add of the filter's impulse response."""
+    np = _numpy()
+    taps = sample_rate // 4  # the 38 Hz high-pass rings out well within 250 ms
+    n_fft = 1 << (4 * taps - 1).bit_length()
+    impulse = np.fft.irfft(_k_weighting_response(n_fft, sample_rate), n_fft)[:taps]
+    kernel = np.fft.rfft(impulse, n_fft)
+
+    step = n_fft - taps + 1
+    out = np.zeros(len(pcm) + n_fft, dtype=np.float64)
+    for i in range(0, len(pcm), step):
+        out[i:i + n_fft] += np.fft.irfft(np.fft.rfft(pcm[i:i + step], n_fft) * kernel, n_fft)
+    return out[:len(pcm)]
+
+
+def integrated_loudness(
+    pcm: np.ndarray, sample_rate: int = SAMPLE_RATE
+) -> Optional[float]:
+    """Gated integrated loudness (LUFS) of a mono float signal.
+
+    Uses 400 ms blocks with 75% overlap of the K-weighted signal, with the
+    BS.1770 absolute (-70 LUFS) and relative (-10 LU) gates. Memory is
+    linear in the signal length. Returns None if the signal is too short
+    or silent.
+    """
+    np = _numpy()
+    block = sample_rate * 400 // 1000
+    hop = block // 4
+    if len(pcm) < block:
+        return None
+
+    energy = _k_weighted(pcm, sample_rate)
+    np.square(energy, out=energy)
+    np.cumsum(energy, out=energy)
+    starts = np.arange(0, len(pcm) - block + 1, hop)
+    before = np.where(starts > 0, energy[starts - 1], 0.0)
+    mean_square = (energy[starts + block - 1] - before) / block
+
+    loudness = -0.691 + 10 * np.log10(mean_square + 1e-12)
+    gated = mean_square[loudness > -70.0]
+    if not len(gated):
+        return None
+    relative = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+    gated = mean_square[loudness > max(-70.0, relative)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def normalization_gain_db(
+    pcm: np.ndarray,
+    target_lufs: float,
+    loudness: Optional[float] = None,
+    sample_rate: int = SAMPLE_RATE,
+) -> float:
+    """Gain needed to reach target_lufs, limited to keep peaks below -1 dBFS."""
+    np = _numpy()
+    if loudness is None:
+        loudness = integrated_loudness(pcm, sample_rate)
+    if loudness is None or not len(pcm):
+        return 0.0
+    gain = target_lufs - loudness
+    peak = float(np.max(np.abs(pcm)))
+    if peak > 0:
+        gain = min(gain, PEAK_CEILING_DB - 20 * np.log10(peak))
+    return float(gain)
+
+
+# ---------------------------------------------------------------------------
+# Clip pipeline (ffmpeg decode once, re-encode only if needed)
+# ---------------------------------------------------------------------------
+
+
+def _decode(audio: bytes, fmt: str, sample_rate: Optional[int]) -> np.ndarray:
+    import subprocess
+
+    np = _numpy()
+    if fmt == "pcm":
+        source = ["-f", "s16le", "-ar", str(sample_rate), "-ac", "1"]
+    else:
+        source = []
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", *source, "-i", "pipe:0",
+         "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        input=audio,
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def _source_params(audio: bytes, fmt: str, sample_rate: Optional[int]) -> tuple:
+    """(sample rate, kbps) of the input clip, where they can be read."""
+    import struct
+
+    from rick_voice import audio as containers
+
+    if fmt == "mp3":
+        frames = containers.mp3_frames(audio[:16384])
+        if frames:
+            return frames[0].sample_rate, frames[0].bitrate
+    elif fmt == "wav" and audio[:4] == b"RIFF" and len(audio) >= 28:
+        return struct.unpack_from("<I", audio, 24)[0], None
+    elif fmt == "ogg":
+        return SAMPLE_RATE, None
+    return sample_rate, None
+
+
+def _encode(
+    pcm: np.ndarray,
+    fmt: str,
+    sample_rate: Optional[int] = None,
+    bitrate: Optional[int] = None,
+) -> bytes:
+    """Encode 48 kHz mono float PCM to fmt at the given rate.
+
+    bitrate (kbps) applies to MP3 only; Opus is always OPUS_BITRATE.
+    """
+    import subprocess
+
+    if fmt == "mp3":
+        target = ["-c:a", "libmp3lame", "-b:a", f"{bitrate or 128}k", "-f", "mp3"]
+    elif fmt == "ogg":
+        target = ["-c:a", "libopus", "-b:a", f"{OPUS_BITRATE}k", "-f", "ogg"]
+    elif fmt == "pcm":
+        target = ["-f", "s16le"]
+    else:
+        target = ["-f", fmt]
+    if sample_rate and fmt != "ogg":
+        target = ["-ar", str(sample_rate), *target]
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "f32le", "-ar", str(SAMPLE_RATE),
+         "-ac", "1", "-i", "pipe:0", *target, "pipe:1"],
+        input=pcm.astype("float32").tobytes(),
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def postprocess(
+    audio: bytes,
+    fmt: str = "mp3",
+    threshold_db: Optional[float] = -45.0,
+    target_lufs: Optional[float] = -16.0,
+    sample_rate: Optional[int] = None,
+    bitrate: Optional[int] = None,
+    output_format: Optional[str] = None,
+) -> PostProcessResult:
+    """Trim silence and normalize loudness of one clip.
+
+    Args:
+        audio: Encoded clip.
+        fmt: Its container: "mp3", "ogg", "wav", or "pcm" for headerless
+             16-bit mono PCM.
+        threshold_db: Frame level (dBFS) below which audio is silence.
+                      None disables trimming.
+        target_lufs: Loudness target. None disables normalization.
+        sample_rate: Sample rate of "pcm" input (required for it), and the
+                     rate to re-encode at when it can't be read from the clip.
+        bitrate: kbps to re-encode MP3 at (defaults to the clip's own).
+                 Ignored for other output formats; Opus is encoded at
+                 OPUS_BITRATE.
+        output_format: Format to return. When it differs from ``fmt`` the
+                       trim and gain are applied inside that one encode
+                       (e.g. straight to OGG Opus for to_ogg()).
+
+    Returns:
+        A PostProcessResult with the new audio and what was done.
+    """
+    from rick_voice import audio as containers
+
+    np = _numpy()
+    if fmt == "pcm" and not sample_rate:
+        raise ValueError("sample_rate is required for raw 'pcm' input")
+
+    started = time.perf_counter()
+    out_fmt = output_format or fmt
+    pcm = _decode(audio, fmt, sample_rate)
+
+    start, end = 0, len(pcm)
+    if threshold_db is not None and len(pcm):
+        start, end = speech_bounds(pcm, threshold_db)
+        if end <= start:
+            start, end = 0, len(pcm)  # all silence — leave it alone
+    speech = pcm[start:end]
+
+    loudness = integrated_loudness(speech)
+    gain_db = 0.0
+    if target_lufs is not None:
+        gain_db = normalization_gain_db(speech, target_lufs, loudness)
+        if abs(gain_db) < GAIN_TOLERANCE_DB:
+            gain_db = 0.0
+
+    lead_ms = start * 1000.0 / SAMPLE_RATE
+    trail_ms = (len(pcm) - end) * 1000.0 / SAMPLE_RATE
+    trimmed = lead_ms >= FRAME_MS or trail_ms >= FRAME_MS
+
+    if gain_db:
+        speech = speech * np.float32(10 ** (gain_db / 20))
+
+    # What the trim removes from the source clip: MP3/OGG are cut at
+    # frame/packet boundaries, raw formats are proportional to samples
+    cut = None
+    bytes_trimmed = 0
+    if trimmed and fmt in ("mp3", "ogg"):
+        cut = containers.trim(audio, lead_ms, lead_ms + len(speech) * 1000.0 / SAMPLE_RATE)
+        bytes_trimmed = len(audio) - len(cut)
+    elif trimmed:
+        bytes_trimmed = int(len(audio) * (1 - len(speech) / len(pcm)))
+
+    reencoded = True
+    if out_fmt != fmt or gain_db or (trimmed and cut is None):
+        rate, kbps = _source_params(audio, fmt, sample_rate)
+        if out_fmt != fmt:
+            rate, kbps = sample_rate, None
+        out = _encode(speech, out_fmt, rate, (bitrate or kbps) if out_fmt == "mp3" else None)
+    elif trimmed:
+        # Whole frames/packets overlapping speech are kept, so report
+        # what was actually cut rather than the sample-level bounds
+        out = cut
+        reencoded = False
+        total_ms = containers.duration_ms(audio)
+        lead_ms = total_ms - containers.duration_ms(containers.trim(audio, lead_ms))
+        trail_ms = max(0.0, total_ms - lead_ms - containers.duration_ms(out))
+    else:
+        out = audio
+        reencoded = False
+        lead_ms = trail_ms = 0.0
+
+    return PostProcessResult(
+        audio=out,
+        bytes_before=len(audio),
+        bytes_after=len(out),
+        bytes_trimmed=bytes_trimmed,
+        leading_ms_trimmed=lead_ms,
+        trailing_ms_trimmed=trail_ms,
+        loudness_lufs=loudness,
+        gain_db=gain_db,
+        reencoded=reencoded,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def postprocess_with_config(
+    audio: bytes,
+    config: RickVoiceConfig,
+    encoding: Optional[tuple] = None,
+    output_format: Optional[str] = None,
+) -> PostProcessResult:
+    """Run postprocess() with the settings from a RickVoiceConfig.
+
+    Args:
+        audio: Clip as returned by the provider.
+        config: Effective config for the request.
+        encoding: (container, sample rate) the provider actually returned,
+                  from TTSProvider.output_encoding(). Defaults to the
+                  config's output_format.
+        output_format: See postprocess().
+    """
+    fmt, sample_rate = encoding or (config.output_format, config.sample_rate)
+    return postprocess(
+        audio,
+        fmt=fmt,
+        threshold_db=config.silence_threshold_db,
+        target_lufs=config.target_lufs,
+        sample_rate=sample_rate,
+        bitrate=config.mp3_bitrate,
+        output_format=output_format,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+
+class StreamProcessor:
+    """Silence trimming and gain for a stream of mono float PCM blocks.
+
+    Leading silence is dropped; silence after speech is held back and only
+    released if speech resumes, so trailing silence never goes out. Gain
+    for target_lufs is estimated from the first ``gain_window_ms`` of
+    speech and then held fixed (changing it mid-stream would pump).
+
+    Usage:
+        proc = StreamProcessor(sample_rate=48000)
+        for block in pcm_blocks:
+            out = proc.process(block)
+            ...
+        tail = proc.flush()
+        proc.leading_ms_trimmed, proc.trailing_ms_trimmed
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        threshold_db: float = -45.0,
+        target_lufs: Optional[float] = -16.0,
+        gain_window_ms: int = 1000,
+    ):
+        np = _numpy()
+        self._np = np
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.target_lufs = target_lufs
+        self._frame = sample_rate * FRAME_MS // 1000
+        self._pad = sample_rate * PAD_MS // 1000
+        self._gain_samples = sample_rate * gain_window_ms // 1000
+
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._held = np.zeros(0, dtype=np.float32)   # silence after speech
+        self._pending = []                           # speech awaiting a gain
+        self._pending_len = 0
+        self._started = False
+        self._gain = None if target_lufs is not None else 1.0
+        self._lead_samples = 0  # silence consumed before speech started
+
+        self.leading_ms_trimmed = 0.0
+        self.trailing_ms_trimmed = 0.0
+
+    def _ms(self, samples: int) -> float:
+        return samples * 1000.0 / self.sample_rate
+
+    def _emit(self, pcm: np.ndarray) -> np.ndarray:
+        """Apply gain, buffering until it has been estimated."""
+        np = self._np
+        if self._gain is None:
+            self._pending.append(pcm)
+            self._pending_len += len(pcm)
+            if self._pending_len < self._gain_samples:
+                return np.zeros(0, dtype=np.float32)
+            return self._release_pending()
+        return pcm * np.float32(self._gain)
+
+    def _release_pending(self) -> np.ndarray:
+        np = self._np
+        pcm = np.concatenate(self._pending) if self._pending else np.zeros(0, np.float32)
+        self._pending, self._pending_len = [], 0
+        if self._gain is None:
+            gain_db = normalization_gain_db(
+                pcm, self.target_lufs, sample_rate=self.sample_rate
+            )
+            self._gain = 10 ** (gain_db / 20) if abs(gain_db) >= GAIN_TOLERANCE_DB else 1.0
+        return pcm * np.float32(self._gain)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feed one block; returns the audio ready to output (may be empty)."""
+        np = self._np
+        pcm = np.concatenate([self._remainder, np.asarray(block, dtype=np.float32)])
+        n = len(pcm) // self._frame
+        self._remainder = pcm[n * self._frame:]
+        if n == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        frames = pcm[:n * self._frame].reshape(n, self._frame)
+        levels = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+        loud = np.flatnonzero(levels > self.threshold_db)
+        body = pcm[:n * self._frame]
+
+        if not len(loud):
+            if self._started:
+                self._held = np.concatenate([self._held, body])
+            else:
+                self._held = np.concatenate([self._held, body])[-self._pad:]
+                self._lead_samples += len(body)
+            return np.zeros(0, dtype=np.float32)
+
+        first, last = loud[0] * self._frame, (loud[-1] + 1) * self._frame
+        if self._started:
+            out = np.concatenate([self._held, body[:last]])
+        else:
+            # Keep PAD_MS of lead-in before the first speech
+            lead = np.concatenate([self._held, body[:first]])
+            kept = lead[-self._pad:]
+            self._lead_samples += first
+            self.leading_ms_trimmed = self._ms(self._lead_samples - len(kept))
+            out = np.concatenate([kept, body[first:last]])
+            self._started = True
+        self._held = body[last:]
+        return self._emit(out)
+
+    def flush(self) -> np.ndarray:
+        """End of stream: drop trailing silence (keeping PAD_MS) and flush."""
+        np = self._np
+        tail = np.concatenate([self._held, self._remainder])
+        if not self._started:
+            self.leading_ms_trimmed = self._ms(self._lead_samples + len(self._remainder))
+            return np.zeros(0, dtype=np.float32)
+        kept = tail[:self._pad]
+        self.trailing_ms_trimmed = self._ms(len(tail) - len(kept))
+        self._held = self._remainder = np.zeros(0, dtype=np.float32)
+
+        out = self._emit(kept)
+        if self._gain is None or self._pending:
+            out = np.concatenate([out, self._release_pending()])
+        return out
@@ -3,24 +3,49 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from rick_voice.config import RickVoiceConfig
 
 
+def config_args(config: Optional[RickVoiceConfig]) -> tuple:
+    """Positional args for a per-call config: empty when there is none.
+
+    Lets callers support providers written before per-call configs.
+    """
+    return () if config is None else (config,)
+
+
 class TTSProvider(ABC):
-    """Base class for all TTS providers."""
+    """Base class for all TTS providers.
+
+    Every method takes an optional per-call ``config``. When given, it
+    replaces ``self.config`` for that call only — the API client built in
+    ``__init__`` is reused, so one provider can serve requests with mixed
+    voices, formats and settings.
+
+    Callers only pass ``config`` when a call actually has overrides, so
+    older subclasses implementing ``synthesize(self, text)`` and
+    ``stream(self, text)`` keep working as long as no overrides are used.
+    """
 
     def __init__(self, config: RickVoiceConfig):
         self.config = config
 
+    def _config(self, config: Optional[RickVoiceConfig]) -> RickVoiceConfig:
+        """Resolve the effective config for a single call."""
+        return config if config is not None else self.config
+
     @abstractmethod
-    def synthesize(self, text: str) -> bytes:
+    def synthesize(
+        self, text: str, config: Optional[RickVoiceConfig] = None
+    ) -> bytes:
         """Convert text to audio bytes.
 
         Args:
             text: Text to speak.
+            config: Per-call config (defaults to self.config).
 
         Returns:
             Audio bytes (format depends on config.output_format).
@@ -28,51 +53,69 @@ class TTSProvider(ABC):
         ...
 
     @abstractmethod
-    def stream(self, text: str):
+    def stream(self, text: str, config: Optional[RickVoiceConfig] = None):
         """Stream audio for real-time playback.
 
         Args:
             text: Text to speak.
+            config: Per-call config (defaults to self.config).
 
         Returns:
             Iterator/generator of audio chunks.
         """
         ...
 
-    def play(self, text: str) -> None:
+    def output_encoding(self, config: Optional[RickVoiceConfig] = None) -> tuple:
+        """What synthesize() actually returns, as (container, sample rate).
+
+        The container is "mp3", "ogg", "wav", or "pcm" for headerless
+        16-bit mono PCM (which needs the sample rate to be decoded).
+        """
+        config = self._config(config)
+        if config.output_format == "pcm":
+            return "pcm", config.sample_rate or 44100
+        return config.output_format, config.sample_rate
+
+    def play(self, text: str, config: Optional[RickVoiceConfig] = None) -> None:
         """Synthesize and play audio through speakers.
 
         Args:
             text: Text to speak.
+            config: Per-call config (defaults to self.config).
         """
         # Default implementation — providers can override for streaming playback
-        audio = self.synthesize(text)
-        self._play_bytes(audio)
+        audio = self.synthesize(text, *config_args(config))
+        self._play_bytes(audio, config)
 
-    def _play_bytes(self, audio: bytes) -> None:
+    def _play_bytes(
+        self, audio: bytes, config: Optional[RickVoiceConfig] = None
+    ) -> None:
         """Play raw audio bytes through speakers."""
         import subprocess
         import tempfile
         import os
 
-        ext = self.config.output_format or "mp3"
-        tmp = os.path.join(tempfile.gettempdir(), f"rick_voice_out.{ext}")
-        with open(tmp, "wb") as f:
+        ext = self._config(config).output_format or "mp3"
+        fd, tmp = tempfile.mkstemp(prefix="rick_voice_out_", suffix=f".{ext}")
+        with os.fdopen(fd, "wb") as f:
             f.write(audio)
 
-        # Try common players
-        for player in ["mpv", "ffplay", "afplay", "aplay"]:
-            try:
-                subprocess.run(
-                    [player, "--no-video", tmp] if player == "mpv"
-                    else [player, "-nodisp", "-autoexit", tmp] if player == "ffplay"
-                    else [player, tmp],
-                    capture_output=True,
-                    check=True,
-                )
-                return
-            except (FileNotFoundError, subprocess.CalledProcessError):
-                continue
+        try:
+            # Try common players
+            for player in ["mpv", "ffplay", "afplay", "aplay"]:
+                try:
+                    subprocess.run(
+                        [player, "--no-video", tmp] if player == "mpv"
+                        else [player, "-nodisp", "-autoexit", tmp] if player == "ffplay"
+                        else [player, tmp],
+                        capture_output=True,
+                        check=True,
+                    )
+                    return
+                except (FileNotFoundError, subprocess.CalledProcessError):
+                    continue
+        finally:
+            os.unlink(tmp)
 
         raise RuntimeError(
             "No audio player found. Install mpv, ffmpeg, or use .synthesize() "
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from rick_voice.providers import TTSProvider
+from rick_voice.providers import TTSProvider, config_args
 
 if TYPE_CHECKING:
     from rick_voice.config import RickVoiceConfig
@@ -46,31 +46,46 @@ class ElevenLabsProvider(TTSProvider):
 
         self._client = ElevenLabs(api_key=config.elevenlabs_api_key)
 
-    def _voice_settings(self) -> dict:
+    def _voice_settings(self, config: RickVoiceConfig) -> dict:
         return {
-            "stability": self.config.elevenlabs_stability,
-            "similarity_boost": self.config.elevenlabs_similarity_boost,
-            "style": self.config.elevenlabs_style,
+            "stability": config.elevenlabs_stability,
+            "similarity_boost": config.elevenlabs_similarity_boost,
+            "style": config.elevenlabs_style,
         }
 
-    def _output_format(self) -> str:
+    def _output_format(self, config: RickVoiceConfig) -> str:
         """Map generic format names to ElevenLabs format strings."""
-        fmt = self.config.output_format
-        mapping = {
-            "mp3": "mp3_44100_128",
-            "wav": "pcm_44100",
-            "pcm": "pcm_22050",
-        }
-        return mapping.get(fmt, fmt)
-
-    def synthesize(self, text: str) -> bytes:
+        fmt = config.output_format
+        if fmt == "mp3":
+            return f"mp3_{config.sample_rate or 44100}_{config.mp3_bitrate or 128}"
+        if fmt == "wav":
+            return f"pcm_{config.sample_rate or 44100}"
+        if fmt == "pcm":
+            return f"pcm_{config.sample_rate or 22050}"
+        return fmt
+
+    def output_encoding(self, config: Optional[RickVoiceConfig] = None) -> tuple:
+        """ElevenLabs "wav" and "pcm" are both headerless pcm_<rate>."""
+        fmt = self._output_format(self._config(config))
+        codec, _, rest = fmt.partition("_")
+        rate = int(rest.split("_")[0]) if rest[:1].isdigit() else None
+        if codec == "pcm":
+            return "pcm", rate
+        if codec == "opus":
+            return "ogg", rate
+        return codec, rate
+
+    def synthesize(
+        self, text: str, config: Optional[RickVoiceConfig] = None
+    ) -> bytes:
         """Convert text to audio bytes via ElevenLabs."""
+        config = self._config(config)
         audio = self._client.text_to_speech.convert(
             text=text,
-            voice_id=self.config.elevenlabs_voice_id,
-            model_id=self.config.elevenlabs_model_id,
-            output_format=self._output_format(),
-            voice_settings=self._voice_settings(),
+            voice_id=config.elevenlabs_voice_id,
+            model_id=config.elevenlabs_model_id,
+            output_format=self._output_format(config),
+            voice_settings=self._voice_settings(config),
         )
 
         # Collect generator chunks
@@ -80,21 +95,23 @@ class ElevenLabsProvider(TTSProvider):
                 chunks.append(chunk)
         return b"".join(chunks)
 
-    def stream(self, text: str):
+    def stream(self, text: str, config: Optional[RickVoiceConfig] = None):
         """Stream audio chunks via ElevenLabs."""
+        config = self._config(config)
         return self._client.text_to_speech.stream(
             text=text,
-            voice_id=self.config.elevenlabs_voice_id,
-            model_id=self.config.elevenlabs_model_id,
-            voice_settings=self._voice_settings(),
+            voice_id=config.elevenlabs_voice_id,
+            model_id=config.elevenlabs_model_id,
+            output_format=self._output_format(config),
+            voice_settings=self._voice_settings(config),
         )
 
-    def play(self, text: str) -> None:
+    def play(self, text: str, config: Optional[RickVoiceConfig] = None) -> None:
         """Stream and play audio via ElevenLabs' built-in streamer."""
         try:
             from elevenlabs import stream as el_stream
 
-            audio_stream = self.stream(text)
+            audio_stream = self.stream(text, *config_args(config))
             el_stream(audio_stream)
         except ImportError:
-            super().play(text)
+            super().play(text, config)
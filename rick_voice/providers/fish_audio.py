@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from rick_voice.providers import TTSProvider
+from rick_voice.providers import TTSProvider, config_args
 
 if TYPE_CHECKING:
     from rick_voice.config import RickVoiceConfig
@@ -38,16 +38,27 @@ class FishAudioProvider(TTSProvider):
 
         self._client = FishAudio(api_key=config.fish_api_key)
 
-    def synthesize(self, text: str) -> bytes:
-        """Convert text to audio bytes via Fish Audio."""
+    def _tts_config(self, config: RickVoiceConfig):
+        """Build the Fish Audio request config from our config."""
         from fishaudio.types import TTSConfig
 
-        config = TTSConfig(
-            reference_id=self.config.fish_voice_id,
-            format=self.config.output_format,
-        )
-
-        audio = self._client.tts.convert(text=text, config=config)
+        kwargs = {
+            "reference_id": config.fish_voice_id,
+            "format": config.output_format,
+            "latency": config.fish_latency,
+        }
+        if config.mp3_bitrate is not None:
+            kwargs["mp3_bitrate"] = config.mp3_bitrate
+        if config.sample_rate is not None:
+            kwargs["sample_rate"] = config.sample_rate
+        return TTSConfig(**kwargs)
+
+    def synthesize(
+        self, text: str, config: Optional[RickVoiceConfig] = None
+    ) -> bytes:
+        """Convert text to audio bytes via Fish Audio."""
+        tts_config = self._tts_config(self._config(config))
+        audio = self._client.tts.convert(text=text, config=tts_config)
 
         # Handle both bytes and generator responses
         if isinstance(audio, bytes):
@@ -59,24 +70,18 @@ class FishAudioProvider(TTSProvider):
                 chunks.append(chunk)
         return b"".join(chunks)
 
-    def stream(self, text: str):
+    def stream(self, text: str, config: Optional[RickVoiceConfig] = None):
         """Stream audio chunks via Fish Audio."""
-        from fishaudio.types import TTSConfig
-
-        config = TTSConfig(
-            reference_id=self.config.fish_voice_id,
-            latency="balanced",
-        )
-
-        return self._client.tts.stream(text=text, config=config)
+        tts_config = self._tts_config(self._config(config))
+        return self._client.tts.stream(text=text, config=tts_config)
 
-    def play(self, text: str) -> None:
+    def play(self, text: str, config: Optional[RickVoiceConfig] = None) -> None:
         """Stream and play audio via Fish Audio's built-in player."""
         try:
             from fishaudio.utils import play
 
-            audio = self.synthesize(text)
+            audio = self.synthesize(text, *config_args(config))
             play(audio)
         except ImportError:
             # Fall back to base implementation
-            super().play(text)
+            super().play(text, config)
@@ -0,0 +1,363 @@
+"""Record-and-replay TTS providers for offline load tests and benchmarks.
+
+RecordingProvider wraps any real provider and captures every request —
+parameters, response audio and chunk timing — into a FixtureStore.
+ReplayProvider then serves those recordings offline, with the original
+timing or scaled by a speed factor, and replay_trace() re-issues a whole
+recorded traffic trace against a RickVoice at N× speed.
+
+Usage:
+    from rick_voice import RickVoice
+    from rick_voice.providers.replay import (
+        FixtureStore, RecordingProvider, ReplayProvider, replay_trace,
+    )
+
+    store = FixtureStore("fixtures/")
+
+    # Record live traffic
+    live = RickVoice()
+    rick = RickVoice(tts_provider=RecordingProvider(live.provider, store))
+    rick.synthesize("Wubba lubba dub dub!")
+
+    # Replay offline at 10× speed
+    rick = RickVoice(tts_provider=ReplayProvider(rick.config, store, speed=10))
+    results = replay_trace(rick, store, speed=10)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Optional
+
+from rick_voice.providers import TTSProvider, config_args
+
+if TYPE_CHECKING:
+    from rick_voice.config import RickVoiceConfig
+    from rick_voice.core import RickVoice
+
+
+# Config fields that never reach the provider request (secrets, text
+# preprocessing that has already happened by the time a provider runs, and
+# audio post-processing that runs after it returns).
+_UNRECORDED_FIELDS = (
+    "fish_api_key",
+    "elevenlabs_api_key",
+    "rickify_enabled",
+    "rickify_intensity",
+    "postprocess_enabled",
+    "silence_threshold_db",
+    "target_lufs",
+)
+
+
+def request_params(config: RickVoiceConfig) -> dict:
+    """Return the config values that shape a provider response."""
+    params = asdict(config)
+    for name in _UNRECORDED_FIELDS:
+        params.pop(name, None)
+    return params
+
+
+def request_key(method: str, text: str, params: dict) -> str:
+    """Stable fixture key for a provider request."""
+    payload = json.dumps(
+        {"method": method, "text": text, "params": params}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Directory of recorded provider responses.
+
+    Layout:
+        index.jsonl        one JSON record per request, in completion order
+        blobs/<sha256>     response audio, content-addressed and deduplicated
+
+    Each record holds the method, text, request params, wall-clock start
+    time (trace() orders records by it) and a list of chunks as [size, delay_seconds] pairs, where the
+    delay is measured from the previous chunk (or the request start).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._blob_dir = os.path.join(path, "blobs")
+        self._index_path = os.path.join(path, "index.jsonl")
+        self._lock = threading.Lock()
+        self._records: dict = {}
+        self._trace: list = []
+
+        os.makedirs(self._blob_dir, exist_ok=True)
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+
+    def _add(self, record: dict) -> None:
+        self._records[record["key"]] = record
+        self._trace.append(record)
+
+    def save(
+        self,
+        method: str,
+        text: str,
+        params: dict,
+        started_at: float,
+        chunks: list,
+        delays: list,
+    ) -> dict:
+        """Store one recorded request and return its record."""
+        audio = b"".join(chunks)
+        blob = hashlib.sha256(audio).hexdigest()
+        record = {
+            "key": request_key(method, text, params),
+            "method": method,
+            "text": text,
+            "params": params,
+            "started_at": started_at,
+            "blob": blob,
+            "chunks": [[len(c), round(d, 6)] for c, d in zip(chunks, delays)],
+        }
+
+        blob_path = os.path.join(self._blob_dir, blob)
+        with self._lock:
+            if not os.path.exists(blob_path):
+                with open(blob_path, "wb") as f:
+                    f.write(audio)
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            self._add(record)
+        return record
+
+    def get(self, method: str, text: str, params: dict) -> dict:
+        """Look up the latest record for a request.
+
+        Raises:
+            KeyError: If the request was never recorded.
+        """
+        key = request_key(method, text, params)
+        try:
+            return self._records[key]
+        except KeyError:
+            raise KeyError(
+                f"No recording for {method}({text[:40]!r}). "
+                f"Record it with RecordingProvider first."
+            ) from None
+
+    def audio(self, record: dict) -> bytes:
+        """Read the response audio for a record."""
+        with open(os.path.join(self._blob_dir, record["blob"]), "rb") as f:
+            return f.read()
+
+    def trace(self) -> list:
+        """All records in arrival order (by request start time).
+
+        The index is appended to as requests finish, so concurrent
+        requests are stored out of order; this restores the order they
+        were sent in.
+        """
+        return sorted(self._trace, key=lambda record: record["started_at"])
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+
+class RecordingProvider(TTSProvider):
+    """Wrap a provider and record every request into a FixtureStore.
+
+    Responses are passed through unchanged; streams are recorded chunk by
+    chunk as the caller consumes them.
+    """
+
+    def __init__(self, inner: TTSProvider, store: FixtureStore):
+        super().__init__(inner.config)
+        self.inner = inner
+        self.store = store
+
+    def output_encoding(self, config: Optional[RickVoiceConfig] = None) -> tuple:
+        """Same encoding as the wrapped provider."""
+        return self.inner.output_encoding(*config_args(config))
+
+    def synthesize(
+        self, text: str, config: Optional[RickVoiceConfig] = None
+    ) -> bytes:
+        """Synthesize via the wrapped provider and record the response."""
+        started_at = time.time()
+        start = time.perf_counter()
+        audio = self.inner.synthesize(text, *config_args(config))
+        elapsed = time.perf_counter() - start
+
+        params = request_params(self._config(config))
+        self.store.save("synthesize", text, params, started_at, [audio], [elapsed])
+        return audio
+
+    def stream(self, text: str, config: Optional[RickVoiceConfig] = None):
+        """Stream via the wrapped provider, recording chunk timing.
+
+        Only time spent waiting on the wrapped provider is recorded, not
+        the time the caller takes to consume each chunk.
+        """
+        params = request_params(self._config(config))
+        started_at = time.time()
+        chunks, delays = [], []
+
+        start = time.perf_counter()
+        iterator = iter(self.inner.stream(text, *config_args(config)))
+        waited = time.perf_counter() - start
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            waited += time.perf_counter() - start
+            if isinstance(chunk, bytes):
+                chunks.append(chunk)
+                delays.append(waited)
+                waited = 0.0
+            yield chunk
+
+        self.store.save("stream", text, params, started_at, chunks, delays)
+
+
+class ReplayProvider(TTSProvider):
+    """Serve recorded responses offline from a FixtureStore.
+
+    Args:
+        config: Config used to look up recordings (per-call overrides
+                apply as usual).
+        store: Fixture store to replay from.
+        speed: Timing scale factor — 1.0 reproduces the recorded latency,
+               10 replays ten times faster, None returns immediately.
+    """
+
+    def __init__(
+        self,
+        config: RickVoiceConfig,
+        store: FixtureStore,
+        speed: Optional[float] = 1.0,
+    ):
+        super().__init__(config)
+        self.store = store
+        self.speed = speed
+
+    def _sleep(self, seconds: float) -> None:
+        if self.speed and seconds > 0:
+            time.sleep(seconds / self.speed)
+
+    def _lookup(self, method: str, text: str, config) -> dict:
+        params = request_params(self._config(config))
+        return self.store.get(method, text, params)
+
+    def synthesize(
+        self, text: str, config: Optional[RickVoiceConfig] = None
+    ) -> bytes:
+        """Return the recorded audio after the (scaled) recorded latency."""
+        try:
+            record = self._lookup("synthesize", text, config)
+        except KeyError:
+            # A recorded stream holds the same audio
+            record = self._lookup("stream", text, config)
+        self._sleep(sum(delay for _, delay in record["chunks"]))
+        return self.store.audio(record)
+
+    def stream(self, text: str, config: Optional[RickVoiceConfig] = None):
+        """Yield the recorded chunks with (scaled) recorded inter-chunk delays."""
+        try:
+            record = self._lookup("stream", text, config)
+        except KeyError:
+            record = self._lookup("synthesize", text, config)
+        audio = self.store.audio(record)
+
+        offset = 0
+        for size, delay in record["chunks"]:
+            self._sleep(delay)
+            yield audio[offset:offset + size]
+            offset += size
+
+
+def replay_trace(
+    rick: RickVoice,
+    store: FixtureStore,
+    speed: Optional[float] = 1.0,
+    max_workers: Optional[int] = None,
+) -> list:
+    """Re-issue a recorded traffic trace against a RickVoice.
+
+    Requests are dispatched at their original inter-arrival times divided
+    by ``speed`` (None dispatches them all at once), each with the
+    recorded params applied as per-call overrides. Recorded texts are
+    already rickified, so rickify is turned off for the replay. Pair with
+    a ReplayProvider to load-test the layers above the provider offline.
+
+    Dispatch is open-loop by default: every request gets its own thread at
+    its scheduled time, however many are still in flight. Pass
+    ``max_workers`` to cap concurrency instead; requests then queue, and
+    "dispatch_lag" shows how late each one actually started.
+
+    Returns:
+        One dict per request, in arrival order, with "text", "method",
+        "dispatch_lag" and "latency" (seconds) and "bytes", or "error" if
+        the call failed.
+    """
+    from dataclasses import fields
+
+    from rick_voice.config import RickVoiceConfig
+
+    trace = store.trace()
+    if not trace:
+        return []
+
+    allowed = {f.name for f in fields(RickVoiceConfig)}
+    allowed -= set(RickVoiceConfig.CLIENT_FIELDS) | set(_UNRECORDED_FIELDS)
+    results: list = [None] * len(trace)
+
+    def _run(i, record, scheduled):
+        overrides = {k: v for k, v in record["params"].items() if k in allowed}
+        overrides["rickify_enabled"] = False
+        result = {"text": record["text"], "method": record["method"]}
+        start = time.perf_counter()
+        result["dispatch_lag"] = max(0.0, start - scheduled)
+        try:
+            if record["method"] == "stream":
+                size = sum(
+                    len(c) for c in rick.stream(record["text"], **overrides)
+                    if isinstance(c, bytes)
+                )
+            else:
+                size = len(rick.synthesize(record["text"], **overrides))
+            result["bytes"] = size
+        except Exception as e:
+            result["error"] = str(e)
+        result["latency"] = time.perf_counter() - start
+        results[i] = result
+
+    t0 = trace[0]["started_at"]  # trace() is sorted by start time
+    wall0 = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
+    threads = []
+
+    # This thread only schedules; the requests run on their own threads.
+    for i, record in enumerate(trace):
+        scheduled = wall0
+        if speed:
+            scheduled += (record["started_at"] - t0) / speed
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+        if pool is not None:
+            pool.submit(_run, i, record, scheduled)
+        else:
+            thread = threading.Thread(target=_run, args=(i, record, scheduled))
+            thread.start()
+            threads.append(thread)
+
+    if pool is not None:
+        pool.shutdown(wait=True)
+    for thread in threads:
+        thread.join()
+    return results
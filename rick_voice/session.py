@@ -0,0 +1,184 @@
+"""Incremental text-in/audio-out sessions for streamed text (e.g. LLM tokens)."""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from rick_voice.core import RickVoice
+
+
+# End of a sentence (plus any closing quotes/brackets) followed by
+# whitespace, or a line break.
+_BOUNDARY = re.compile(r"[.!?…]+[\"')\]”’]*\s+|\n+")
+
+_END = object()
+
+
+class SpeechSession:
+    """Speak text as it arrives, one sentence at a time.
+
+    Text fragments are buffered until a sentence boundary appears; each
+    complete sentence is dispatched to the provider straight away, while
+    later text is still arriving. Up to ``max_ahead`` sentences are
+    synthesized concurrently, and their audio is yielded strictly in order,
+    so sentence 1 can be playing while sentence 3 is still being written.
+
+    Usage:
+        session = rick.session()
+
+        def produce():
+            with session:  # close() when done, cancel() on error
+                for token in llm_tokens():
+                    session.feed(token)
+
+        threading.Thread(target=produce).start()
+        for chunk in session:
+            player.write(chunk)
+
+    Feed and iterate on different threads, so audio plays while text is
+    still arriving. cancel() (or stopping iteration early) abandons the
+    session: queued sentences are never sent to the provider and running
+    ones stop at their next chunk.
+
+    Args:
+        rick: RickVoice instance to synthesize with.
+        min_chars: Sentences shorter than this are merged with the next
+                   one, to avoid a provider round trip per "Hi." or "Uh.".
+        max_ahead: Maximum number of sentences synthesized concurrently.
+        **overrides: Per-call config overrides applied to every sentence.
+    """
+
+    def __init__(
+        self,
+        rick: RickVoice,
+        min_chars: int = 20,
+        max_ahead: int = 3,
+        **overrides,
+    ):
+        # Validate overrides up front rather than in a worker thread
+        rick.config.with_overrides(**overrides)
+
+        self._rick = rick
+        self._min_chars = min_chars
+        self._overrides = overrides
+        self._buffer = ""
+        self._closed = False
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._segments: queue.Queue = queue.Queue()
+        self._pending: list = []  # (future, chunk queue) per segment
+        self._pool = ThreadPoolExecutor(max_workers=max_ahead)
+
+    def feed(self, text: str) -> None:
+        """Add a text fragment; dispatches any sentences it completes."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Can't feed a closed SpeechSession")
+            self._buffer += text
+            for segment in self._split():
+                self._dispatch(segment)
+
+    def close(self) -> None:
+        """Flush remaining text and mark the end of the audio stream."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            tail = self._buffer.strip()
+            self._buffer = ""
+            if tail:
+                self._dispatch(tail)
+            self._segments.put(_END)
+        self._pool.shutdown(wait=False)
+
+    def cancel(self) -> None:
+        """Abandon the session, skipping any audio not yet synthesized.
+
+        Sentences still queued are never sent to the provider, running
+        ones stop at their next chunk, and iteration ends.
+        """
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            self._closed = True
+            self._buffer = ""
+            self._segments.put(_END)
+            for future, chunks in self._pending:
+                if future.cancel():
+                    chunks.put(_END)
+            self._pending = []
+        self._pool.shutdown(wait=False)
+
+    def _split(self) -> list:
+        """Cut complete sentences off the front of the buffer."""
+        segments = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            segment = self._buffer[start:match.end()].strip()
+            if len(segment) >= self._min_chars:
+                segments.append(segment)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return segments
+
+    def _dispatch(self, segment: str) -> None:
+        chunks: queue.Queue = queue.Queue()
+        self._segments.put(chunks)
+        future = self._pool.submit(self._synthesize, segment, chunks)
+        self._pending = [p for p in self._pending if not p[0].done()]
+        self._pending.append((future, chunks))
+
+    def _synthesize(self, segment: str, chunks: queue.Queue) -> None:
+        try:
+            if not self._cancelled.is_set():
+                stream = self._rick.stream(segment, **self._overrides)
+                try:
+                    for chunk in stream:
+                        if self._cancelled.is_set():
+                            break
+                        if isinstance(chunk, bytes):
+                            chunks.put(chunk)
+                finally:
+                    if hasattr(stream, "close"):
+                        stream.close()  # end the provider request early
+        except Exception as e:
+            chunks.put(e)
+        chunks.put(_END)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield audio chunks for every sentence, in order.
+
+        Stopping iteration early cancels the session.
+        """
+        finished = False
+        try:
+            while not self._cancelled.is_set():
+                chunks = self._segments.get()
+                if chunks is _END:
+                    break
+                while True:
+                    chunk = chunks.get()
+                    if chunk is _END or self._cancelled.is_set():
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+            finished = True
+        finally:
+            if not finished:
+                self.cancel()
+
+    def __enter__(self) -> "SpeechSession":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.cancel()
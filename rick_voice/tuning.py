@@ -0,0 +1,305 @@
+"""Adaptive latency/quality tuning for provider streaming parameters.
+
+An AutoTuner watches how long each provider takes to deliver its first
+byte (TTFB) and how fast it streams afterwards, per provider, request
+method, text length bucket and parameter setting. For each new request it
+picks the highest-quality setting expected to meet a TTFB target.
+
+Usage:
+    from rick_voice import RickVoice
+    from rick_voice.tuning import AutoTuner
+
+    rick = RickVoice(tuner=AutoTuner(target_ttfb_ms=400))
+    for chunk in rick.stream("Wubba lubba dub dub!"):
+        ...
+
+    rick.tuner.decisions   # recent choices and why
+    rick.tuner.stats()     # measured TTFB/throughput per setting
+
+Explicit per-call overrides always win over the tuner's choice.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Candidate settings per provider, best quality first. Each is a dict of
+# per-call config overrides.
+DEFAULT_CANDIDATES: Dict[str, List[dict]] = {
+    "fish": [
+        {"fish_latency": "normal", "mp3_bitrate": 192},
+        {"fish_latency": "normal", "mp3_bitrate": 128},
+        {"fish_latency": "balanced", "mp3_bitrate": 128},
+        {"fish_latency": "balanced", "mp3_bitrate": 64},
+    ],
+    # mp3_44100_192 needs a paid ElevenLabs plan, so it isn't a default
+    "elevenlabs": [
+        {"mp3_bitrate": 128, "sample_rate": 44100},
+        {"mp3_bitrate": 64, "sample_rate": 44100},
+        {"mp3_bitrate": 32, "sample_rate": 22050},
+    ],
+}
+
+# Upper bounds (in characters) of the text length buckets.
+DEFAULT_LENGTH_BUCKETS = (80, 300)
+
+
+@dataclass
+class Measurement:
+    """Smoothed observations for one (provider, method, bucket, setting)."""
+
+    count: int = 0
+    ttfb_ms: float = 0.0
+    bytes_per_sec: float = 0.0
+    failures: int = 0            # consecutive failed requests
+    errors: int = 0              # total failed requests
+    last_failure: float = 0.0    # time.time() of the latest failure
+
+    def update(self, ttfb_ms: float, bytes_per_sec: Optional[float], alpha: float) -> None:
+        if self.count == 0:
+            self.ttfb_ms = ttfb_ms
+            self.bytes_per_sec = bytes_per_sec or 0.0
+        else:
+            self.ttfb_ms += alpha * (ttfb_ms - self.ttfb_ms)
+            if bytes_per_sec is not None:
+                self.bytes_per_sec += alpha * (bytes_per_sec - self.bytes_per_sec)
+        self.count += 1
+        self.failures = 0
+
+    def fail(self) -> None:
+        self.failures += 1
+        self.errors += 1
+        self.last_failure = time.time()
+
+
+class AutoTuner:
+    """Pick streaming parameters per request to meet a TTFB target.
+
+    Args:
+        target_ttfb_ms: Time-to-first-byte goal per request.
+        candidates: Settings per provider, best quality first. Defaults to
+                    DEFAULT_CANDIDATES.
+        length_buckets: Character-count upper bounds splitting texts into
+                        buckets that are measured separately.
+        min_samples: Observations needed before a setting is trusted;
+                     untrusted settings are tried before being skipped.
+        explore_rate: Chance of probing the next-better setting than the
+                      current choice, so improvements are noticed.
+        alpha: EWMA smoothing factor for measurements.
+        history: Number of recent decisions kept in ``decisions``.
+        max_failures: Consecutive failures after which a setting is
+                      skipped (e.g. a bitrate the account can't use).
+        failure_cooldown: Seconds a failing setting is skipped before it
+                          is tried again.
+    """
+
+    def __init__(
+        self,
+        target_ttfb_ms: float = 500.0,
+        candidates: Optional[Dict[str, List[dict]]] = None,
+        length_buckets: Tuple[int, ...] = DEFAULT_LENGTH_BUCKETS,
+        min_samples: int = 2,
+        explore_rate: float = 0.05,
+        alpha: float = 0.3,
+        history: int = 100,
+        max_failures: int = 2,
+        failure_cooldown: float = 300.0,
+    ):
+        self.target_ttfb_ms = target_ttfb_ms
+        self.candidates = candidates if candidates is not None else DEFAULT_CANDIDATES
+        self.length_buckets = tuple(length_buckets)
+        self.min_samples = min_samples
+        self.explore_rate = explore_rate
+        self.alpha = alpha
+        self.max_failures = max_failures
+        self.failure_cooldown = failure_cooldown
+        self.decisions: deque = deque(maxlen=history)
+        self._stats: Dict[tuple, Measurement] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, text: str) -> int:
+        """Index of the length bucket a text falls into."""
+        for i, limit in enumerate(self.length_buckets):
+            if len(text) <= limit:
+                return i
+        return len(self.length_buckets)
+
+    def tuned_keys(self, provider: str, output_format: str = "mp3") -> set:
+        """Config fields the tuner may set for a provider."""
+        options = self._options(provider, output_format).values()
+        return {key for option in options for key in option}
+
+    def _blocked(self, m: Measurement, now: float) -> bool:
+        return (
+            m.failures >= self.max_failures
+            and now - m.last_failure < self.failure_cooldown
+        )
+
+    def _options(self, provider: str, output_format: str) -> Dict[int, dict]:
+        """Candidates that apply to an output format, by index.
+
+        mp3_bitrate means nothing for other formats, so candidates that
+        only differ in it collapse into the first of them.
+        """
+        options: Dict[int, dict] = {}
+        for i, option in enumerate(self.candidates.get(provider, [])):
+            if output_format != "mp3":
+                option = {k: v for k, v in option.items() if k != "mp3_bitrate"}
+                if option in options.values():
+                    continue
+            options[i] = option
+        return options
+
+    def choose(
+        self, provider: str, method: str, text: str, output_format: str = "mp3"
+    ) -> Tuple[int, dict]:
+        """Pick a setting for a request.
+
+        Returns:
+            (candidate index, config overrides). The index is -1 and the
+            overrides empty when the provider has no candidates.
+        """
+        options = self._options(provider, output_format)
+        if not options:
+            return -1, {}
+
+        bucket = self.bucket(text)
+        with self._lock:
+            measured = {
+                i: self._stats.get((provider, method, bucket, i), Measurement())
+                for i in options
+            }
+
+        now = time.time()
+        usable = [i for i, m in measured.items() if not self._blocked(m, now)]
+
+        reason = None
+        choice = None
+        if not usable:
+            # Everything is failing — retry the one that failed longest ago
+            choice = min(options, key=lambda i: measured[i].last_failure)
+            reason = "all settings failing, retrying oldest failure"
+        for i in usable:
+            m = measured[i]
+            if m.count < self.min_samples:
+                choice, reason = i, "exploring (not enough samples)"
+                break
+            if m.ttfb_ms <= self.target_ttfb_ms:
+                choice, reason = i, f"meets target ({m.ttfb_ms:.0f} ms)"
+                break
+        if choice is None:
+            choice = min(usable, key=lambda i: measured[i].ttfb_ms)
+            reason = f"fastest available ({measured[choice].ttfb_ms:.0f} ms, misses target)"
+        elif usable and random.random() < self.explore_rate:
+            better = [i for i in usable if i < choice]
+            if better:
+                choice, reason = better[-1], "probing higher quality"
+
+        overrides = dict(options[choice])
+        self.decisions.append({
+            "time": time.time(),
+            "provider": provider,
+            "method": method,
+            "chars": len(text),
+            "bucket": bucket,
+            "candidate": choice,
+            "overrides": overrides,
+            "reason": reason,
+        })
+        return choice, overrides
+
+    def record(
+        self,
+        provider: str,
+        method: str,
+        text: str,
+        candidate: int,
+        ttfb_ms: float,
+        total_bytes: int = 0,
+        total_ms: Optional[float] = None,
+    ) -> None:
+        """Record an observed request for a candidate setting."""
+        if candidate < 0:
+            return
+        bytes_per_sec = None
+        if total_ms is not None and total_ms > ttfb_ms and total_bytes:
+            bytes_per_sec = total_bytes / ((total_ms - ttfb_ms) / 1000.0)
+
+        key = (provider, method, self.bucket(text), candidate)
+        with self._lock:
+            self._stats.setdefault(key, Measurement()).update(
+                ttfb_ms, bytes_per_sec, self.alpha
+            )
+
+    def record_failure(
+        self, provider: str, method: str, text: str, candidate: int
+    ) -> None:
+        """Record a failed request; repeated failures block the setting."""
+        if candidate < 0:
+            return
+        key = (provider, method, self.bucket(text), candidate)
+        with self._lock:
+            self._stats.setdefault(key, Measurement()).fail()
+
+    def stats(self) -> List[dict]:
+        """Current measurements, one dict per observed setting."""
+        with self._lock:
+            items = sorted(self._stats.items())
+        return [
+            {
+                "provider": provider,
+                "method": method,
+                "bucket": bucket,
+                "candidate": candidate,
+                "overrides": self.candidates[provider][candidate],
+                "count": m.count,
+                "ttfb_ms": round(m.ttfb_ms, 1),
+                "bytes_per_sec": round(m.bytes_per_sec, 1),
+                "failures": m.failures,
+                "errors": m.errors,
+            }
+            for (provider, method, bucket, candidate), m in items
+        ]
+
+    def measure_stream(
+        self,
+        chunks: Iterable,
+        provider: str,
+        text: str,
+        candidate: int,
+    ) -> Iterator:
+        """Pass stream chunks through, recording TTFB and throughput.
+
+        Only time spent waiting on the provider counts — not the time the
+        caller takes between chunks. A stream that raises is recorded as
+        a failure.
+        """
+        iterator = iter(chunks)
+        waited = 0.0
+        ttfb_ms = None
+        total = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                waited += time.perf_counter() - start
+                if ttfb_ms is None:
+                    ttfb_ms = waited * 1000
+                if isinstance(chunk, bytes):
+                    total += len(chunk)
+                yield chunk
+        except Exception:
+            self.record_failure(provider, "stream", text, candidate)
+            raise
+
+        if ttfb_ms is not None:
+            self.record(provider, "stream", text, candidate, ttfb_ms, total, waited * 1000)
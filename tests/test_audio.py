@@ -0,0 +1,157 @@
+"""Tests for container-level MP3 / OGG Opus splicing."""
+
+import struct
+
+import pytest
+
+from rick_voice import audio
+
+
+def _reference_crc_table():
+    table = []
+    for i in range(256):
+        r = i << 24
+        for _ in range(8):
+            r = ((r << 1) ^ 0x04C11DB7) if r & 0x80000000 else r << 1
+        table.append(r & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _reference_crc_table()
+
+
+def _reference_crc(data: bytes) -> int:
+    crc = 0
+    for b in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[(crc >> 24) ^ b]
+    return crc
+
+
+def _opus_clip(n_packets, packet_size=100, pre_skip=312, end_trim=0, serial=1):
+    """Build an OGG Opus clip of 20 ms CELT packets (960 samples each)."""
+    head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HIhB", pre_skip, 48000, 0, 0)
+    tags = b"OpusTags" + struct.pack("<II", 0, 0)
+    packets = [
+        bytes([0xF8]) + bytes([i % 256]) * (packet_size - 1)
+        for i in range(n_packets)
+    ]
+    stream = audio.OpusStream(head, tags, packets, serial, 0)
+    return audio._write_opus(stream, packets, end_trim=end_trim)
+
+
+def _pages(data):
+    """Yield (flags, granule, sequence, crc, page bytes) for each OGG page."""
+    pos = 0
+    while pos < len(data):
+        _, _, flags, granule, _, sequence, crc, n = audio._OGG_HEADER.unpack_from(data, pos)
+        length = 27 + n + sum(data[pos + 27:pos + 27 + n])
+        yield flags, granule, sequence, crc, data[pos:pos + length]
+        pos += length
+
+
+def _mp3_clip(n_frames):
+    """MPEG-1 Layer III, 128 kbps, 44.1 kHz stereo frames of silence."""
+    frames = []
+    for i in range(n_frames):
+        padding = i % 2
+        length = 144 * 128000 // 44100 + padding
+        header = bytes([0xFF, 0xFB, 0x90 | (padding << 1), 0x00])
+        frames.append(header + b"\x00" * (length - 4))
+    return b"".join(frames)
+
+
+@pytest.mark.parametrize("data", [b"", b"123456789", bytes(range(256)) * 7])
+def test_ogg_crc_matches_reference_table(data):
+    assert audio._ogg_crc(data) == _reference_crc(data)
+
+
+def test_written_pages_have_valid_crc_and_sequence():
+    clip = _opus_clip(300)
+    pages = list(_pages(clip))
+    assert [p[2] for p in pages] == list(range(len(pages)))
+    for _, _, _, crc, page in pages:
+        assert crc == _reference_crc(page[:22] + b"\x00" * 4 + page[26:])
+
+
+def test_trim_ogg_full_range_keeps_everything():
+    clip = _opus_clip(50, end_trim=100)
+    trimmed = audio.trim(clip, 0, None)
+    assert len(audio.parse_opus(trimmed).packets) == 50
+    assert audio.duration_ms(trimmed) == audio.duration_ms(clip)
+
+
+def test_trim_ogg_range():
+    clip = _opus_clip(50)
+    trimmed = audio.trim(clip, start_ms=100, end_ms=500)
+    # Packets overlapping 100-500 ms of playable time (after pre-skip)
+    assert len(audio.parse_opus(trimmed).packets) == 21
+
+
+def test_trim_ogg_empty_range_returns_nothing():
+    clip = _opus_clip(10)
+    assert audio.trim(clip, start_ms=5000) == b""
+
+
+def test_packet_spanning_pages_is_flagged_and_round_trips():
+    head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HIhB", 0, 48000, 0, 0)
+    tags = b"OpusTags" + struct.pack("<II", 0, 0)
+    packets = [bytes([0xF8]) + b"a" * 70000, bytes([0xF8]) + b"b" * (255 * 255 - 1), b"\xf8"]
+    data = audio._write_opus(audio.OpusStream(head, tags, packets, 1, 0), packets)
+
+    audio_pages = list(_pages(data))[2:]
+    assert len(audio_pages) > 2
+    first, second = audio_pages[0], audio_pages[1]
+    assert not first[0] & 0x01
+    assert first[1] == -1  # no packet finishes on the first page
+    assert second[0] & 0x01  # starts with the tail of the big packet
+    assert audio.parse_opus(data).packets == packets
+
+
+def test_concat_ogg_granule_positions():
+    a = _opus_clip(30, end_trim=200, serial=1)
+    b = _opus_clip(20, end_trim=100, serial=2)
+    joined = audio.concat(a, b)
+
+    stream = audio.parse_opus(joined)
+    assert len(stream.packets) == 50
+
+    pages = list(_pages(joined))
+    assert all(p[2] == i for i, p in enumerate(pages))
+    audio_pages = [p for p in pages[2:] if p[1] != -1]
+    granules = [p[1] for p in audio_pages]
+    assert granules == sorted(granules)
+    assert all(g % 960 == 0 for g in granules[:-1])
+    assert granules[-1] == 50 * 960 - 100  # last clip's end trim preserved
+    assert pages[-1][0] & 0x04  # EOS
+
+    # The join keeps b's pre-skip (312) and a's end padding (200): known
+    # overhead, documented in concat_ogg
+    added = (312 + 200) / 48.0
+    expected = audio.duration_ms(a) + audio.duration_ms(b) + added
+    assert audio.duration_ms(joined) == pytest.approx(expected)
+
+
+def test_concat_ogg_rejects_channel_mismatch():
+    mono = _opus_clip(5)
+    stream = audio.parse_opus(mono)
+    head = stream.head[:9] + bytes([2]) + stream.head[10:]
+    stereo = audio._write_opus(
+        audio.OpusStream(head, stream.tags, stream.packets, 1, 0), stream.packets
+    )
+    with pytest.raises(ValueError):
+        audio.concat(mono, stereo)
+
+
+def test_mp3_frames_skip_tags():
+    id3 = b"ID3" + bytes([4, 0, 0, 0, 0, 0, 10]) + b"\x00" * 10
+    data = id3 + _mp3_clip(40) + b"TAG" + b"\x00" * 125
+    assert len(audio.mp3_frames(data)) == 40
+    assert audio.detect_format(data) == "mp3"
+
+
+def test_mp3_concat_and_trim():
+    clip = _mp3_clip(40)
+    joined = audio.concat(clip, clip)
+    assert len(audio.mp3_frames(joined)) == 80
+    assert audio.trim(joined, 0, None) == joined
+    assert len(audio.mp3_frames(audio.trim(joined, 0, 1000))) == 39
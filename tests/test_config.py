@@ -0,0 +1,63 @@
+"""Tests for per-call config overrides."""
+
+import pytest
+
+from rick_voice import RickVoice, RickVoiceConfig
+from rick_voice.providers import TTSProvider
+
+
+def test_with_overrides_rejects_unknown_field():
+    with pytest.raises(ValueError, match="Unknown config override"):
+        RickVoiceConfig().with_overrides(bitrate=64)
+
+
+@pytest.mark.parametrize("field", RickVoiceConfig.CLIENT_FIELDS)
+def test_with_overrides_rejects_client_fields(field):
+    with pytest.raises(ValueError, match="can't be overridden per call"):
+        RickVoiceConfig().with_overrides(**{field: "x"})
+
+
+def test_with_overrides_leaves_base_untouched():
+    base = RickVoiceConfig(output_format="mp3")
+    copy = base.with_overrides(output_format="wav", mp3_bitrate=64)
+    assert (copy.output_format, copy.mp3_bitrate) == ("wav", 64)
+    assert (base.output_format, base.mp3_bitrate) == ("mp3", None)
+    assert base.with_overrides() is base
+
+
+class _OldStyleProvider(TTSProvider):
+    """Provider written before per-call configs existed."""
+
+    def synthesize(self, text):
+        return f"{self.config.output_format}:{text}".encode()
+
+    def stream(self, text):
+        yield self.synthesize(text)
+
+
+class _RecordingProvider(TTSProvider):
+    def synthesize(self, text, config=None):
+        self.seen = config
+        return self._config(config).output_format.encode()
+
+    def stream(self, text, config=None):
+        yield self.synthesize(text, config)
+
+
+def test_old_style_provider_works_without_overrides():
+    rick = RickVoice(tts_provider=_OldStyleProvider(RickVoiceConfig()))
+    assert rick.synthesize("hi") == b"mp3:hi"
+    assert list(rick.stream("hi")) == [b"mp3:hi"]
+
+
+def test_overrides_reach_provider_without_changing_shared_config():
+    rick = RickVoice()
+    provider = _RecordingProvider(rick.config)
+    rick._provider = provider
+
+    assert rick.synthesize("hi", output_format="wav") == b"wav"
+    assert provider.seen.output_format == "wav"
+    assert rick.config.output_format == "mp3"
+
+    assert rick.synthesize("hi") == b"mp3"
+    assert provider.seen is None
@@ -0,0 +1,106 @@
+"""Tests for silence trimming and loudness normalization."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rick_voice import audio, postprocess  # noqa: E402
+
+
+def _sine(sample_rate, seconds=3.0, amplitude=0.1, freq=1000):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_k_weighting_matches_spec_at_48k():
+    shelf, highpass = postprocess.k_weighting(48000)
+    assert shelf[0] == pytest.approx((1.53512485958697, -2.69169618940638, 1.19839281085285))
+    assert shelf[1] == pytest.approx((1.0, -1.69065929318241, 0.73248077421585))
+    assert highpass[1] == pytest.approx((1.0, -1.99004745483398, 0.99007225036621))
+
+
+@pytest.mark.parametrize("sample_rate", [48000, 44100, 22050])
+def test_loudness_is_rate_independent(sample_rate):
+    # 1 kHz sine at -20 dBFS RMS-ish reads about -23 LUFS (K-weighting ~ +0.7 dB)
+    loudness = postprocess.integrated_loudness(_sine(sample_rate), sample_rate)
+    assert loudness == pytest.approx(-23.0, abs=0.1)
+
+
+def test_stream_processor_normalizes_and_trims_at_22050():
+    sample_rate = 22050
+    silence = np.zeros(sample_rate // 2, dtype=np.float32)
+    signal = np.concatenate([silence, _sine(sample_rate, 2.0, 0.05, 300), silence])
+
+    proc = postprocess.StreamProcessor(sample_rate=sample_rate, target_lufs=-16.0)
+    out = np.concatenate(
+        [proc.process(b) for b in np.array_split(signal, 20)] + [proc.flush()]
+    )
+
+    assert postprocess.integrated_loudness(out, sample_rate) == pytest.approx(-16.0, abs=0.2)
+    assert proc.leading_ms_trimmed == pytest.approx(440.0, abs=10)
+    assert proc.trailing_ms_trimmed == pytest.approx(440.0, abs=10)
+
+
+def _mp3_clip(n_frames):
+    """MPEG-1 Layer III, 128 kbps, 44.1 kHz frames (1152 samples each)."""
+    frames = []
+    for i in range(n_frames):
+        length = 144 * 128000 // 44100 + i % 2
+        frames.append(bytes([0xFF, 0xFB, 0x90 | ((i % 2) << 1), 0x00]) + b"\x00" * (length - 4))
+    return b"".join(frames)
+
+
+@pytest.fixture
+def fake_codec(monkeypatch):
+    """Decode any clip to 1 s of silence with a tone at 300-700 ms."""
+    encoded = []
+    rate = postprocess.SAMPLE_RATE
+
+    def decode(audio, fmt, sample_rate):
+        pcm = np.zeros(int(rate * 1.045), dtype=np.float32)
+        pcm[int(rate * 0.3):int(rate * 0.7)] = _sine(rate, 0.4, 0.1)
+        return pcm
+
+    def encode(pcm, fmt, sample_rate=None, bitrate=None):
+        encoded.append((fmt, bitrate))
+        return b"OggS" + b"\x00" * 100
+
+    monkeypatch.setattr(postprocess, "_decode", decode)
+    monkeypatch.setattr(postprocess, "_encode", encode)
+    return encoded
+
+
+def test_container_trim_reports_frame_boundaries(fake_codec):
+    clip = _mp3_clip(40)
+    result = postprocess.postprocess(clip, "mp3", target_lufs=None)
+
+    assert not result.reencoded and not fake_codec
+    frame_ms = 1152 * 1000 / 44100
+    # Speech (less PAD_MS) starts at 240 ms, inside frame 9
+    assert result.leading_ms_trimmed == pytest.approx(9 * frame_ms)
+    assert result.leading_ms_trimmed + result.trailing_ms_trimmed == pytest.approx(
+        40 * frame_ms - audio.mp3_duration_ms(result.audio)
+    )
+    assert result.bytes_trimmed == len(clip) - len(result.audio)
+
+
+def test_opus_output_reports_source_bytes_and_ignores_mp3_bitrate(fake_codec):
+    clip = _mp3_clip(40)
+    result = postprocess.postprocess(clip, "mp3", bitrate=192, output_format="ogg")
+
+    assert fake_codec == [("ogg", None)]
+    kept = audio.trim(clip, result.leading_ms_trimmed, 760)
+    assert result.bytes_trimmed == len(clip) - len(kept)
+    assert result.bytes_trimmed != result.bytes_before - result.bytes_after
+
+
+def test_opus_encode_uses_fixed_bitrate(monkeypatch):
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        return type("Result", (), {"stdout": b""})()
+
+    monkeypatch.setattr("subprocess.run", run)
+    postprocess._encode(np.zeros(10, np.float32), "ogg", 44100, bitrate=192)
+    assert calls[0][calls[0].index("-b:a") + 1] == f"{postprocess.OPUS_BITRATE}k"
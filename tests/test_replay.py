@@ -0,0 +1,92 @@
+"""Tests for the record-and-replay provider harness."""
+
+import threading
+import time
+
+import pytest
+
+from rick_voice import RickVoice, RickVoiceConfig
+from rick_voice.providers import TTSProvider
+from rick_voice.providers.replay import (
+    FixtureStore,
+    RecordingProvider,
+    ReplayProvider,
+    replay_trace,
+)
+
+
+class _SlowProvider(TTSProvider):
+    """Fake provider: latency per text, streamed as two chunks."""
+
+    latency = {"slow": 0.3, "fast one": 0.01, "fast two": 0.01}
+
+    def synthesize(self, text, config=None):
+        time.sleep(self.latency.get(text, 0.01))
+        return text.encode()
+
+    def stream(self, text, config=None):
+        time.sleep(self.latency.get(text, 0.01))
+        yield text.encode()
+        time.sleep(0.02)
+        yield b"!"
+
+
+def _recording(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    rick = RickVoice(tts_provider=RecordingProvider(_SlowProvider(RickVoiceConfig()), store))
+    return rick, store
+
+
+def test_replay_serves_recorded_audio(tmp_path):
+    rick, store = _recording(tmp_path)
+    assert rick.synthesize("fast one") == b"fast one"
+    assert list(rick.stream("fast two")) == [b"fast two", b"!"]
+
+    replay = RickVoice(tts_provider=ReplayProvider(rick.config, store, speed=None))
+    assert replay.synthesize("fast one") == b"fast one"
+    assert list(replay.stream("fast two")) == [b"fast two", b"!"]
+    assert replay.synthesize("fast two") == b"fast two!"  # stream fallback
+    with pytest.raises(KeyError):
+        replay.synthesize("never recorded")
+
+
+def test_stream_delays_exclude_consumer_time(tmp_path):
+    rick, store = _recording(tmp_path)
+    for _ in rick.stream("fast one"):
+        time.sleep(0.2)  # slow consumer
+
+    (record,) = store.trace()
+    delays = [delay for _, delay in record["chunks"]]
+    assert delays[0] == pytest.approx(0.01, abs=0.05)
+    assert delays[1] == pytest.approx(0.02, abs=0.05)
+
+
+def test_concurrent_recording_replays_in_arrival_order(tmp_path):
+    rick, store = _recording(tmp_path)
+    threads = []
+    for text in ("slow", "fast one", "fast two"):
+        thread = threading.Thread(target=rick.synthesize, args=(text,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+
+    # Index is in completion order, the trace in arrival order
+    assert [r["text"] for r in FixtureStore(str(tmp_path))._trace][-1] == "slow"
+    assert [r["text"] for r in store.trace()] == ["slow", "fast one", "fast two"]
+
+    dispatched = []
+
+    class _Logged(ReplayProvider):
+        def synthesize(self, text, config=None):
+            dispatched.append(text)
+            return super().synthesize(text, config)
+
+    replay = RickVoice(tts_provider=_Logged(rick.config, store, speed=None))
+    results = replay_trace(replay, store, speed=1.0)
+
+    assert dispatched == ["slow", "fast one", "fast two"]
+    assert [r["text"] for r in results] == ["slow", "fast one", "fast two"]
+    assert all("error" not in r for r in results)
+    assert max(r["dispatch_lag"] for r in results) < 0.03
@@ -0,0 +1,116 @@
+"""Tests for incremental SpeechSessions."""
+
+import threading
+import time
+
+import pytest
+
+from rick_voice import RickVoice, RickVoiceConfig
+from rick_voice.providers import TTSProvider
+
+
+class _FakeProvider(TTSProvider):
+    """Streams each text back in two chunks; longer texts finish sooner."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def synthesize(self, text, config=None):
+        return b"".join(self.stream(text, config))
+
+    def stream(self, text, config=None):
+        with self._lock:
+            self.calls.append(text)
+        if "fail" in text:
+            raise RuntimeError("provider error")
+        time.sleep(max(0.0, 0.2 - len(text) / 500))
+        yield text.encode()
+        time.sleep(0.01)
+        yield b"|"
+
+
+def _session(**kwargs):
+    provider = _FakeProvider(RickVoiceConfig())
+    rick = RickVoice(tts_provider=provider)
+    return rick.session(**kwargs), provider
+
+
+def _sentences(session):
+    return b"".join(session).decode().split("|")[:-1]
+
+
+def test_audio_in_order_when_later_sentences_finish_first():
+    session, _ = _session(min_chars=1)
+    texts = ["Short one.", "A much longer second sentence" + ", which returns sooner" * 5 + "."]
+    for text in texts:
+        session.feed(text + " ")
+    session.close()
+    assert _sentences(session) == [t.strip() for t in texts]
+
+
+def test_short_sentences_are_merged():
+    session, provider = _session(min_chars=20)
+    session.feed("Hi. Uh. Listen to me, Morty. ")
+    session.close()
+    assert _sentences(session) == ["Hi. Uh. Listen to me, Morty."]
+    assert provider.calls == ["Hi. Uh. Listen to me, Morty."]
+
+
+def test_close_flushes_tail():
+    session, provider = _session(min_chars=1)
+    session.feed("First sentence. And a tail without punctuation")
+    assert provider.calls in ([], ["First sentence."])
+    session.close()
+    assert _sentences(session) == ["First sentence.", "And a tail without punctuation"]
+
+
+def test_provider_error_reaches_consumer():
+    session, _ = _session(min_chars=1)
+    session.feed("This one will fail. ")
+    session.close()
+    with pytest.raises(RuntimeError, match="provider error"):
+        list(session)
+
+
+def test_feeding_in_a_thread_streams_before_input_ends():
+    session, _ = _session(min_chars=1)
+    release = threading.Event()
+
+    def produce():
+        with session:
+            session.feed("Sentence one. ")
+            release.wait(2)
+            session.feed("Sentence two. ")
+
+    threading.Thread(target=produce).start()
+    chunks = iter(session)
+    assert next(chunks) == b"Sentence one."  # before the producer finished
+    release.set()
+    assert b"".join(chunks) == b"|Sentence two.|"
+
+
+def test_cancel_skips_queued_sentences():
+    session, provider = _session(min_chars=1, max_ahead=1)
+    for i in range(5):
+        session.feed(f"Sentence number {i}. ")
+
+    chunks = iter(session)
+    assert next(chunks) == b"Sentence number 0."
+    chunks.close()  # consumer stops listening
+
+    time.sleep(0.5)
+    assert len(provider.calls) < 5
+    with pytest.raises(RuntimeError):
+        session.feed("More text. ")
+
+
+def test_explicit_cancel_ends_iteration():
+    session, provider = _session(min_chars=1, max_ahead=1)
+    for i in range(5):
+        session.feed(f"Sentence number {i}. ")
+    session.cancel()
+    assert len(list(session)) <= 2
+    time.sleep(0.3)
+    assert len(provider.calls) <= 1
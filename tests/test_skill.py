@@ -0,0 +1,79 @@
+"""Tests for the OpenClaw skill's batch helpers."""
+
+import io
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "openclaw-skill"))
+
+import rick_voice_skill as skill  # noqa: E402
+
+
+class _FakeRick:
+    """Stands in for RickVoice; slower for earlier texts, fails on "boom"."""
+
+    provider = None
+
+    def to_ogg(self, text):
+        if "boom" in text:
+            raise RuntimeError("synthesis failed")
+        time.sleep(0.05 if text == "first" else 0)
+        return b"OggS" + text.encode()
+
+
+@pytest.fixture
+def fake_rick(monkeypatch):
+    monkeypatch.setattr(skill, "_get_rick", lambda: _FakeRick())
+
+
+@pytest.mark.parametrize("line, expected", [
+    ('"hello"', {"text": "hello"}),
+    ('{"text": "hi", "output_path": "/tmp/x.ogg"}', {"text": "hi", "output_path": "/tmp/x.ogg"}),
+])
+def test_parse_batch_line_accepts_strings_and_objects(line, expected):
+    assert skill._parse_batch_line(line) == expected
+
+
+@pytest.mark.parametrize("line", ["not json", "42", '{"text": 5}', '{"output_path": "x"}'])
+def test_parse_batch_line_rejects_bad_lines(line):
+    result = skill._parse_batch_line(line)
+    assert result["text"] is None and result["error"]
+
+
+def test_parse_batch_line_rejects_bad_output_path():
+    result = skill._parse_batch_line('{"text": "hi", "output_path": 3}')
+    assert result == {"text": "hi", "error": "'output_path' must be a string"}
+
+
+def test_run_batch_keeps_order_and_reports_errors(fake_rick, tmp_path):
+    lines = [
+        json.dumps({"text": "first", "output_path": str(tmp_path / "a.ogg")}),
+        "not json",
+        "",
+        json.dumps({"text": "boom", "output_path": str(tmp_path / "b.ogg")}),
+        json.dumps({"text": "last", "output_path": str(tmp_path / "c.ogg")}),
+    ]
+    out = io.StringIO()
+    skill._run_batch(io.StringIO("\n".join(lines)), out)
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["text"] for r in results] == ["first", None, "boom", "last"]
+    assert results[0]["path"] == str(tmp_path / "a.ogg")
+    assert "error" in results[1] and "error" in results[2]
+    assert (tmp_path / "c.ogg").read_bytes() == b"OggSlast"
+    assert not (tmp_path / "b.ogg").exists()
+
+
+def test_generate_voice_messages_in_order(fake_rick, tmp_path):
+    paths = skill.generate_voice_messages(["first", "second"], output_dir=str(tmp_path))
+    assert [open(p, "rb").read() for p in paths] == [b"OggSfirst", b"OggSsecond"]
+
+
+def test_generate_voice_messages_cleans_up_on_failure(fake_rick, tmp_path):
+    with pytest.raises(RuntimeError):
+        skill.generate_voice_messages(["first", "boom", "last"], output_dir=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
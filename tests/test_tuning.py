@@ -0,0 +1,85 @@
+"""Tests for the adaptive latency/quality tuner."""
+
+import time
+
+import pytest
+
+from rick_voice import RickVoice
+from rick_voice.providers import TTSProvider
+from rick_voice.tuning import AutoTuner
+
+
+class _PaidOnly192(TTSProvider):
+    """Fake provider that rejects 192 kbps, like a free-tier account."""
+
+    def synthesize(self, text, config=None):
+        if self._config(config).mp3_bitrate == 192:
+            raise RuntimeError("format requires a paid plan")
+        return b"audio"
+
+    def stream(self, text, config=None):
+        if self._config(config).mp3_bitrate == 192:
+            raise RuntimeError("format requires a paid plan")
+        yield b"audio"
+
+
+def _rick(**tuner_kwargs):
+    rick = RickVoice(tuner=AutoTuner(explore_rate=0, **tuner_kwargs))
+    rick._provider = _PaidOnly192(rick.config)
+    return rick
+
+
+def test_failing_candidate_is_skipped():
+    rick = _rick(max_failures=2)
+    results = []
+    for _ in range(20):
+        try:
+            results.append(rick.synthesize("hi"))
+        except RuntimeError:
+            results.append(None)
+
+    assert results.count(None) == 2
+    stats = {s["candidate"]: s for s in rick.tuner.stats()}
+    assert stats[0]["errors"] == 2 and stats[0]["count"] == 0
+    assert stats[1]["count"] == 18
+
+
+def test_failing_stream_is_recorded():
+    rick = _rick(max_failures=1)
+    with pytest.raises(RuntimeError):
+        list(rick.stream("hi"))
+    assert list(rick.stream("hi")) == [b"audio"]
+    assert rick.tuner.decisions[-1]["candidate"] == 1
+
+
+def test_pinned_override_skips_tuner_decision():
+    rick = _rick()
+    rick.synthesize("hi", mp3_bitrate=64)
+    assert not rick.tuner.decisions
+    assert rick.tuner.stats() == []
+
+
+def test_bitrate_only_candidates_collapse_for_non_mp3():
+    rick = _rick(target_ttfb_ms=-1)  # nothing meets it, so all get explored
+    for _ in range(10):
+        rick.synthesize("hi", output_format="wav")
+    tried = {d["candidate"] for d in rick.tuner.decisions}
+    assert tried == {0, 2}  # 1 and 3 only differ from them in mp3_bitrate
+    assert all("mp3_bitrate" not in d["overrides"] for d in rick.tuner.decisions)
+
+
+def test_stream_throughput_ignores_consumer_time():
+    tuner = AutoTuner()
+
+    def chunks():
+        time.sleep(0.05)
+        yield b"x" * 1000
+        time.sleep(0.05)
+        yield b"x" * 1000
+
+    for _ in tuner.measure_stream(chunks(), "fish", "hi", 0):
+        time.sleep(0.3)  # slow consumer
+
+    (stats,) = tuner.stats()
+    assert stats["ttfb_ms"] == pytest.approx(50, abs=30)
+    assert stats["bytes_per_sec"] == pytest.approx(2000 / 0.05, rel=0.5)